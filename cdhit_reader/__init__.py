@@ -1,17 +1,53 @@
-from ._cli import cli
-from ._compare import compare
-from ._reader import ParsingError, ClusterSequence, Cluster, ClstrReader, read_cdhit, SeqType, Strand
+from importlib import import_module
+
+from ._reader import ParsingError, ParsingReport, ClusterSequence, Cluster, ClstrReader, read_cdhit, SeqType, Strand
 from ._fasta import Sequence, FastaReader, read_fasta
-from ._testit import test
 from ._version import __version__
-#from ._writer import FASTAWriter, write_fasta
+from ._writer import FastaWriter, write_fasta
+
+# Command line tools and extensions are only imported on first access, so
+# that reading files does not pay for click and friends.
+_LAZY = {
+    "ClstrCache": "._cache",
+    "CachedClstrReader": "._cache",
+    "ClusterCollection": "._collection",
+    "cli": "._cli",
+    "compare": "._compare",
+    "split": "._split",
+    "split_clusters": "._split",
+    "NameSet": "._subset",
+    "representatives": "._subset",
+    "cluster_members": "._subset",
+    "subset_fasta": "._subset",
+    "subset": "._subset",
+    "export_tsv": "._export",
+    "export_sqlite": "._export",
+    "export": "._export",
+    "ClusterTable": "._table",
+    "cluster_table": "._table",
+    "sample_parser": "._table",
+    "table": "._table",
+    "map_clusters": "._parallel",
+    "reduce_clusters": "._parallel",
+    "sort_clusters": "._sort",
+    "sort": "._sort",
+    "Assignment": "._assign",
+    "RepresentativeIndex": "._assign",
+    "ClusterIndex": "._sample",
+    "sample_clusters": "._sample",
+    "test": "._testit",
+}
 
 __all__ = [
     "ParsingError",
+    "ParsingReport",
     "ClusterSequence",
     "Cluster",
     "ClstrReader",
     "read_cdhit",
+    "ClstrCache",
+    "CachedClstrReader",
+    "ClusterCollection",
     "FastaReader",
     "read_fasta",
     "SeqType",
@@ -19,8 +55,44 @@ __all__ = [
     "Sequence",
     "FastaReader",
     "read_fasta",
+    "FastaWriter",
+    "write_fasta",
     "__version__",
     "cli",
     "compare",
+    "split",
+    "split_clusters",
+    "NameSet",
+    "representatives",
+    "cluster_members",
+    "subset_fasta",
+    "subset",
+    "export_tsv",
+    "export_sqlite",
+    "export",
+    "ClusterTable",
+    "cluster_table",
+    "sample_parser",
+    "table",
+    "map_clusters",
+    "reduce_clusters",
+    "sort_clusters",
+    "sort",
+    "Assignment",
+    "RepresentativeIndex",
+    "ClusterIndex",
+    "sample_clusters",
     "test",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,215 @@
+from __future__ import annotations
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from ._fasta import FastaReader, Sequence
+from ._reader import ClstrReader, SeqType, Strand
+
+__all__ = ["Assignment", "RepresentativeIndex", "word_length"]
+
+_NT = set("ACGTUN")
+_COMPLEMENT = str.maketrans("ACGTUNacgtun", "TGCAANtgcaan")
+
+
+class Assignment(NamedTuple):
+    """
+    Assignment of a query sequence to a cluster.
+
+    `representative` is ``None`` when no representative is close enough:
+    the query would start a new cluster.
+    """
+
+    query: str
+    representative: Optional[str]
+    identity: float
+    strand: Strand
+
+
+def word_length(identity: float, seqtype: SeqType) -> int:
+    """
+    Default cd-hit word length for an identity threshold.
+
+    Parameters
+    ----------
+    identity
+        Identity threshold, between 0 and 1.
+    seqtype
+        Sequence type.
+
+    Returns
+    -------
+    Word length.
+    """
+    if seqtype == SeqType.PROTEIN:
+        thresholds = [(0.7, 5), (0.6, 4), (0.5, 3)]
+        default = 2
+    else:
+        thresholds = [(0.95, 10), (0.9, 8), (0.88, 7), (0.85, 6), (0.8, 5)]
+        default = 4
+    for threshold, k in thresholds:
+        if identity >= threshold:
+            return k
+    return default
+
+
+def _words(sequence: str, k: int) -> set:
+    return {sequence[i:i + k] for i in range(len(sequence) - k + 1)}
+
+
+class RepresentativeIndex:
+    """
+    In-memory k-mer index of cluster representatives, assigning new
+    sequences to the closest representative without running cd-hit.
+
+    As in cd-hit's short word filter, a query with ``W`` words of length
+    ``k`` sharing ``s`` words with a representative is estimated to differ
+    in ``(W - s) / k`` positions, counted over the shorter of the two
+    sequences. The query is assigned to the representative with the highest
+    estimated identity, if it reaches the threshold. The estimate does not
+    account for gaps, and is usually higher than the identity cd-hit
+    reports after alignment. Nucleotide queries are also compared on the
+    reverse strand, like cd-hit-est.
+    """
+
+    def __init__(
+        self,
+        sequences: Iterable[Union[Sequence, Tuple[str, str]]],
+        identity: float = 0.9,
+        seqtype: Optional[SeqType] = None,
+        k: Optional[int] = None,
+    ):
+        """
+        Parameters
+        ----------
+        sequences
+            Representative sequences, as `Sequence` objects or
+            ``(name, sequence)`` pairs.
+        identity
+            Identity threshold, between 0 and 1. Defaults to ``0.9``.
+        seqtype
+            Sequence type. Defaults to guessing from the first sequence.
+        k
+            Word length. Defaults to cd-hit's for `identity`.
+        """
+        self.identity = identity
+        self.names: List[str] = []
+        self._lengths = array("I")
+        self._nwords = array("I")
+        postings: Dict[str, array] = {}
+
+        for item in sequences:
+            name, sequence = (item.name, item.sequence) if isinstance(item, Sequence) else item
+            sequence = sequence.upper()
+            if seqtype is None:
+                seqtype = SeqType.NT if set(sequence) <= _NT else SeqType.PROTEIN
+            if k is None:
+                k = word_length(identity, seqtype)
+            words = _words(sequence, k)
+            rep = len(self.names)
+            for word in words:
+                ids = postings.get(word)
+                if ids is None:
+                    ids = postings[word] = array("I")
+                ids.append(rep)
+            self.names.append(name)
+            self._lengths.append(len(sequence))
+            self._nwords.append(len(words))
+
+        self.seqtype = seqtype if seqtype is not None else SeqType.NONE
+        self.k = k if k is not None else word_length(identity, self.seqtype)
+        self._postings = postings
+
+    @classmethod
+    def from_files(
+        cls,
+        clstr: Union[str, Path, IO[str]],
+        fasta: Union[str, Path, IO[str]],
+        identity: float = 0.9,
+        k: Optional[int] = None,
+    ) -> RepresentativeIndex:
+        """
+        Index the representatives of a clustering.
+
+        Parameters
+        ----------
+        clstr
+            CD-HIT file path or IO stream.
+        fasta
+            FASTA file path or IO stream containing the representatives.
+        identity
+            Identity threshold, between 0 and 1. Defaults to ``0.9``.
+        k
+            Word length. Defaults to cd-hit's for `identity`.
+
+        Returns
+        -------
+        Representative index.
+        """
+        refs = set()
+        seqtype = None
+        with ClstrReader(clstr) as reader:
+            for cluster in reader:
+                if cluster.refname is not None:
+                    refs.add(cluster.refname)
+                    seqtype = cluster.sequences[0].seqtype
+        with FastaReader(fasta) as sequences:
+            return cls((seq for seq in sequences if seq.name in refs), identity=identity, seqtype=seqtype, k=k)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _best(self, sequence: str) -> Tuple[Optional[int], float]:
+        k = self.k
+        words = _words(sequence, k)
+        if not words:
+            return None, 0.0
+        shared = Counter()
+        for word in words:
+            ids = self._postings.get(word)
+            if ids is not None:
+                shared.update(ids)
+
+        best, best_identity = None, 0.0
+        for rep, common in shared.items():
+            # Estimated differences over the shorter of the two sequences
+            if self._lengths[rep] < len(sequence):
+                length, nwords = self._lengths[rep], self._nwords[rep]
+            else:
+                length, nwords = len(sequence), len(words)
+            identity = 1.0 - max(nwords - common, 0) / k / length
+            if identity > best_identity:
+                best, best_identity = rep, identity
+        return best, best_identity
+
+    def assign(self, queries: Iterable[Union[Sequence, Tuple[str, str]]]) -> List[Assignment]:
+        """
+        Assign a batch of sequences to representatives.
+
+        Parameters
+        ----------
+        queries
+            Query sequences, as `Sequence` objects or ``(name, sequence)``
+            pairs.
+
+        Returns
+        -------
+        One assignment per query, in order.
+        """
+        assignments = []
+        for item in queries:
+            name, sequence = (item.name, item.sequence) if isinstance(item, Sequence) else item
+            sequence = sequence.upper()
+            rep, identity = self._best(sequence)
+            strand = Strand.NONE
+            if self.seqtype == SeqType.NT:
+                strand = Strand.PLUS
+                rc_rep, rc_identity = self._best(sequence.translate(_COMPLEMENT)[::-1])
+                if rc_identity > identity:
+                    rep, identity, strand = rc_rep, rc_identity, Strand.REVERSE
+            if rep is None or identity < self.identity:
+                assignments.append(Assignment(name, None, identity, strand))
+            else:
+                assignments.append(Assignment(name, self.names[rep], identity, strand))
+        return assignments
@@ -0,0 +1,397 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from ._reader import ClstrReader, Cluster, ClusterSequence, SeqType, Strand
+
+if TYPE_CHECKING:
+    from ._collection import ClusterCollection
+
+__all__ = ["ClstrCache", "CachedClstrReader"]
+
+_MAGIC = b"CDHC"
+_VERSION = 2
+_SUFFIX = ".cdhc"
+
+# magic, version, source size, source mtime (ns), fingerprint,
+# number of clusters, number of members, offset of the cluster index
+_HEADER = struct.Struct("<4sHxxQq16sQQQ")
+# name length, reference name length (0xFFFFFFFF if none), number of
+# members, size of the member block
+_CLUSTER = struct.Struct("<IIII")
+# id, length, identity, is_ref, seqtype, strand, name length, line length
+_MEMBER = struct.Struct("<qqdBBBxII")
+_NO_REF = 0xFFFFFFFF
+_OFFSET = struct.Struct("<Q")
+
+_SEQTYPES = [SeqType.NONE, SeqType.PROTEIN, SeqType.NT]
+_STRANDS = [Strand.NONE, Strand.PLUS, Strand.REVERSE]
+_SEQTYPE_CODES = {t: i for i, t in enumerate(_SEQTYPES)}
+_STRAND_CODES = {s: i for i, s in enumerate(_STRANDS)}
+
+_FINGERPRINT_BLOCK = 1 << 16
+
+DEFAULT_MAX_SIZE = 4 << 30
+
+
+def _default_cache_dir() -> Path:
+    if "CDHIT_READER_CACHE" in os.environ:
+        return Path(os.environ["CDHIT_READER_CACHE"])
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "cdhit_reader"
+
+
+def _fingerprint(path: Path, size: int) -> bytes:
+    """
+    Digest of the first and last blocks of a file, a cheap content check
+    on top of size and modification time.
+    """
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as fh:
+        digest.update(fh.read(_FINGERPRINT_BLOCK))
+        if size > _FINGERPRINT_BLOCK:
+            fh.seek(max(_FINGERPRINT_BLOCK, size - _FINGERPRINT_BLOCK))
+            digest.update(fh.read())
+    return digest.digest()
+
+
+class _PackedCluster(Cluster):
+    """
+    Cluster decoded from a binary record. The members are kept packed until
+    `sequences` is first accessed, so that loading a snapshot only decodes
+    the cluster names.
+    """
+
+    def __init__(self, name: str, refname: Optional[str], nseqs: int, members: bytes):
+        self.name = name
+        self.refname = refname
+        self._nseqs = nseqs
+        self._members = members
+
+    def __getattr__(self, name: str):
+        if name != "sequences":
+            raise AttributeError(name)
+        self.sequences = _unpack_members(self._members, self._nseqs)
+        del self._members
+        return self.sequences
+
+    def __len__(self):
+        if "sequences" in self.__dict__:
+            return len(self.sequences)
+        return self._nseqs
+
+
+def _pack_cluster(cluster: Cluster) -> bytes:
+    """
+    Encode a cluster into the compact binary record used by the snapshots:
+    a header, the cluster and reference names, then the fixed-size member
+    fields followed by the member names and lines.
+    """
+    name = cluster.name.encode()
+    refname = cluster.refname.encode() if cluster.refname is not None else b""
+    if isinstance(cluster, _PackedCluster) and "sequences" not in cluster.__dict__:
+        nseqs = cluster._nseqs
+        members = cluster._members
+    else:
+        nseqs = len(cluster.sequences)
+        fields = []
+        strings = []
+        for seq in cluster.sequences:
+            seqname = seq.name.encode()
+            line = seq.line.encode()
+            fields.append(
+                _MEMBER.pack(
+                    seq.id,
+                    seq.length,
+                    seq.identity,
+                    seq.is_ref,
+                    _SEQTYPE_CODES[seq.seqtype],
+                    _STRAND_CODES[seq.strand],
+                    len(seqname),
+                    len(line),
+                )
+            )
+            strings.append(seqname)
+            strings.append(line)
+        members = b"".join(fields + strings)
+    header = _CLUSTER.pack(len(name), len(refname) if cluster.refname is not None else _NO_REF, nseqs, len(members))
+    return b"".join([header, name, refname, members])
+
+
+def _unpack_members(members: bytes, nseqs: int) -> List[ClusterSequence]:
+    sequences = []
+    offset = nseqs * _MEMBER.size
+    for id, length, identity, is_ref, seqtype, strand, seqname_len, line_len in _MEMBER.iter_unpack(
+        memoryview(members)[:offset]
+    ):
+        seq = ClusterSequence.__new__(ClusterSequence)
+        seq.name = str(members[offset:offset + seqname_len], "utf-8")
+        offset += seqname_len
+        seq.line = str(members[offset:offset + line_len], "utf-8")
+        offset += line_len
+        seq.id = id
+        seq.length = length
+        seq.identity = identity
+        seq.is_ref = bool(is_ref)
+        seq.seqtype = _SEQTYPES[seqtype]
+        seq.strand = _STRANDS[strand]
+        sequences.append(seq)
+    return sequences
+
+
+def _unpack_cluster(buffer, offset: int) -> Tuple[Cluster, int]:
+    """
+    Decode the cluster record starting at `offset`. Only the names are
+    decoded: the members are decoded on first access.
+
+    Returns
+    -------
+    The cluster and the offset of the next record.
+    """
+    name_len, refname_len, nseqs, members_len = _CLUSTER.unpack_from(buffer, offset)
+    offset += _CLUSTER.size
+    name = str(buffer[offset:offset + name_len], "utf-8")
+    offset += name_len
+    if refname_len == _NO_REF:
+        refname = None
+    else:
+        refname = str(buffer[offset:offset + refname_len], "utf-8")
+        offset += refname_len
+    members = bytes(buffer[offset:offset + members_len])
+    return _PackedCluster(name, refname, nseqs, members), offset + members_len
+
+
+class CachedClstrReader:
+    """
+    CD-HIT (Clstr) reader over a memory-mapped snapshot.
+
+    Behaves like `ClstrReader`, and additionally supports ``len()`` and
+    random access to clusters by index.
+    """
+
+    def __init__(self, file: Union[str, Path]):
+        """
+        Parameters
+        ----------
+        file
+            Snapshot path.
+        """
+        self._file = open(file, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mmap, 0)
+        self._nclusters = header[5]
+        self._index_offset = header[7]
+        self._offset = _HEADER.size
+
+    def read_item(self) -> Cluster:
+        """
+        Get the next item.
+
+        Returns
+        -------
+        Next item.
+        """
+        if self._offset >= self._index_offset:
+            raise StopIteration
+        cluster, self._offset = _unpack_cluster(self._mmap, self._offset)
+        return cluster
+
+    def read_items(self, max_memory: Optional[int] = None) -> Union[List[Cluster], ClusterCollection]:
+        """
+        Get the list of all items.
+
+        Parameters
+        ----------
+        max_memory
+            Approximate memory budget in bytes. If given, return a
+            `ClusterCollection` that moves the clusters beyond the budget to
+            a temporary file. Defaults to a plain list.
+
+        Returns
+        -------
+        List of all items.
+        """
+        if max_memory is None:
+            return list(self)
+        from ._collection import ClusterCollection
+
+        return ClusterCollection(self, max_memory=max_memory)
+
+    def close(self):
+        """
+        Close the associated snapshot.
+        """
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._nclusters
+
+    def __getitem__(self, index: int) -> Cluster:
+        if index < 0:
+            index += self._nclusters
+        if not 0 <= index < self._nclusters:
+            raise IndexError("cluster index out of range")
+        (offset,) = _OFFSET.unpack_from(self._mmap, self._index_offset + index * _OFFSET.size)
+        return _unpack_cluster(self._mmap, offset)[0]
+
+    def __iter__(self) -> Iterator[Cluster]:
+        while True:
+            try:
+                yield self.read_item()
+            except StopIteration:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        self.close()
+
+
+class ClstrCache:
+    """
+    On-disk cache of parsed CD-HIT files.
+
+    Each source file gets one binary snapshot, named after its resolved path
+    and validated against the size, modification time and a content
+    fingerprint of the source: a stale snapshot is rebuilt transparently.
+    The directory is kept under `max_size` bytes by evicting the least
+    recently used snapshots.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        cache_dir
+            Cache directory. Defaults to ``$CDHIT_READER_CACHE``, or
+            ``cdhit_reader`` in the user cache directory.
+        max_size
+            Maximum total size of the snapshots, in bytes.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _default_cache_dir()
+        self.max_size = max_size
+
+    def open(self, file: Union[str, Path]) -> CachedClstrReader:
+        """
+        Open a CD-HIT file through the cache, parsing it only if no valid
+        snapshot exists.
+
+        Parameters
+        ----------
+        file
+            File path.
+
+        Returns
+        -------
+        Reader over the snapshot.
+        """
+        source = Path(file).resolve()
+        stat = source.stat()
+        fingerprint = _fingerprint(source, stat.st_size)
+        snapshot = self.snapshot_path(source)
+
+        if self._is_valid(snapshot, stat, fingerprint):
+            os.utime(snapshot)
+        else:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._build(source, snapshot, stat, fingerprint)
+            self._evict(keep=snapshot)
+        return CachedClstrReader(snapshot)
+
+    def snapshot_path(self, file: Union[str, Path]) -> Path:
+        """
+        Snapshot path for a source file.
+        """
+        key = hashlib.blake2b(str(Path(file).resolve()).encode(), digest_size=16).hexdigest()
+        return self.cache_dir / (key + _SUFFIX)
+
+    def clear(self):
+        """
+        Remove all snapshots.
+        """
+        for snapshot in self._snapshots():
+            snapshot.unlink()
+
+    def _snapshots(self) -> List[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob("*" + _SUFFIX))
+
+    def _is_valid(self, snapshot: Path, stat: os.stat_result, fingerprint: bytes) -> bool:
+        try:
+            with open(snapshot, "rb") as fh:
+                header = fh.read(_HEADER.size)
+        except OSError:
+            return False
+        if len(header) != _HEADER.size:
+            return False
+        magic, version, size, mtime_ns, stored_fingerprint = _HEADER.unpack(header)[:5]
+        return (
+            magic == _MAGIC
+            and version == _VERSION
+            and size == stat.st_size
+            and mtime_ns == stat.st_mtime_ns
+            and stored_fingerprint == fingerprint
+        )
+
+    def _build(self, source: Path, snapshot: Path, stat: os.stat_result, fingerprint: bytes):
+        fd, tmpname = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                self._write(source, out, stat, fingerprint)
+            os.replace(tmpname, snapshot)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+    def _write(self, source: Path, out: IO[bytes], stat: os.stat_result, fingerprint: bytes):
+        out.write(b"\0" * _HEADER.size)
+        offsets = array("Q")
+        position = _HEADER.size
+        nmembers = 0
+        with ClstrReader(source) as reader:
+            for cluster in reader:
+                record = _pack_cluster(cluster)
+                offsets.append(position)
+                out.write(record)
+                position += len(record)
+                nmembers += len(cluster)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        out.write(offsets.tobytes())
+        out.seek(0)
+        out.write(
+            _HEADER.pack(_MAGIC, _VERSION, stat.st_size, stat.st_mtime_ns, fingerprint, len(offsets), nmembers, position)
+        )
+
+    def _evict(self, keep: Path):
+        entries = []
+        for snapshot in self._snapshots():
+            try:
+                st = snapshot.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, snapshot))
+        total = sum(size for _, size, _ in entries)
+        for _, size, snapshot in sorted(entries):
+            if total <= self.max_size:
+                break
+            if snapshot == keep:
+                continue
+            try:
+                snapshot.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -5,6 +5,7 @@ from statistics import mean
 import click
 
 from ._reader import read_cdhit
+from ._sample import sample_clusters
 from ._version import __version__
 #from ._writer import write_fasta
 
@@ -15,7 +16,10 @@ from ._version import __version__
 @click.option("--stats/--no-stats", default=True, help="Show sequence statistics.")
 @click.option("--hist/--no-hist", default=False, help="Show histogram of sequence lengths.")
 @click.option("--all", default=False, is_flag=True, help="Show all sequences in the cluster.")
-def cli(clstr, stats: bool, hist: bool, all: bool):
+@click.option("--sample", type=int, help="Only use a random sample of this many clusters (per stratum with --strata).")
+@click.option("--seed", type=int, help="Random seed for --sample.")
+@click.option("--strata", help="Comma-separated lower bounds of cluster size strata for --sample, e.g. 1,2,10.")
+def cli(clstr, stats: bool, hist: bool, all: bool, sample: int, seed: int, strata: str):
     """
     Show information about CLSTR file
 
@@ -25,10 +29,18 @@ def cli(clstr, stats: bool, hist: bool, all: bool):
     The commad line interface is in EXPERIMENTAL stage.  
     """
 
+    if sample is None and (seed is not None or strata is not None):
+        raise click.UsageError("--seed and --strata require --sample.")
+
     nitems = 0
     nseqs = 0
     seq_lens = []
-    for item in read_cdhit(clstr):
+    if sample is not None:
+        bounds = [int(bound) for bound in strata.split(",")] if strata else None
+        clusters = sample_clusters(clstr, sample, seed=seed, strata=bounds)
+    else:
+        clusters = read_cdhit(clstr)
+    for item in clusters:
         seq_lens.append(len(item))
         nitems += 1
         nseqs  += len(item)
@@ -41,8 +53,9 @@ def cli(clstr, stats: bool, hist: bool, all: bool):
         click.echo(f"Number of clusters: {nitems}")
         click.echo(f"Total sequences: {nseqs}")
         
-        msg = f"Cluster size: min {min(seq_lens)}, mean {mean(seq_lens):.2f}, max {max(seq_lens)}"
-        click.echo(msg)
+        if seq_lens:
+            msg = f"Cluster size: min {min(seq_lens)}, mean {mean(seq_lens):.2f}, max {max(seq_lens)}"
+            click.echo(msg)
 
     if hist:
         show_hist(seq_lens)
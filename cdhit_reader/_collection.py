@@ -0,0 +1,166 @@
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+import tempfile
+
+from ._cache import _MEMBER, _PackedCluster, _pack_cluster, _unpack_cluster
+from ._reader import Cluster
+
+__all__ = ["ClusterCollection"]
+
+# Rough size in memory of a parsed cluster and of each member, on top of
+# the text of the member lines and names
+_CLUSTER_OVERHEAD = 200
+_MEMBER_OVERHEAD = 360
+
+
+def _estimate(cluster: Cluster) -> int:
+    if isinstance(cluster, _PackedCluster) and "sequences" not in cluster.__dict__:
+        # Size once decoded, without decoding the members
+        strings = len(cluster._members) - cluster._nseqs * _MEMBER.size
+        return _CLUSTER_OVERHEAD + cluster._nseqs * _MEMBER_OVERHEAD + strings
+    return _CLUSTER_OVERHEAD + sum(_MEMBER_OVERHEAD + len(seq.line) + len(seq.name) for seq in cluster.sequences)
+
+
+class ClusterCollection:
+    """
+    Read-only list of clusters within a memory budget.
+
+    The most recently added or accessed clusters are kept in memory. Beyond
+    `max_memory`, the least recently used ones are moved to a temporary
+    file, in the compact format of the cache snapshots, and read back on
+    access. Clusters read back by indexing are kept in memory as recently
+    used; clusters read back by iteration are not, so that a full scan does
+    not evict the hot ones.
+
+    Changes made to a cluster object are lost once it is moved to disk.
+    """
+
+    def __init__(
+        self,
+        clusters: Iterable[Cluster],
+        max_memory: int = 256 << 20,
+        tempdir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        clusters
+            Clusters, e.g. a `ClstrReader`.
+        max_memory
+            Approximate memory budget for the clusters kept in memory, in
+            bytes. Defaults to 256 MiB.
+        tempdir
+            Directory for the temporary file. Defaults to the system one.
+        """
+        self.max_memory = max_memory
+        self._tempdir = tempdir
+        self._store = None
+        self._store_end = 0
+        self._unflushed = False
+        # Position and length of each cluster in the store, -1 if not stored
+        self._offsets = array("q")
+        self._lengths = array("Q")
+        self._memory: OrderedDict[int, Cluster] = OrderedDict()
+        self._sizes = {}
+        self._used = 0
+        for cluster in clusters:
+            self._offsets.append(-1)
+            self._lengths.append(0)
+            self._keep(len(self._offsets) - 1, cluster)
+
+    @property
+    def spilled(self) -> int:
+        """
+        Number of clusters not currently in memory.
+
+        Returns
+        -------
+        Number of clusters.
+        """
+        return len(self._offsets) - len(self._memory)
+
+    def _keep(self, index: int, cluster: Cluster):
+        size = _estimate(cluster)
+        self._memory[index] = cluster
+        self._sizes[index] = size
+        self._used += size
+        # The cluster just added stays, even if it alone exceeds the budget
+        while self._used > self.max_memory and len(self._memory) > 1:
+            self._evict()
+
+    def _evict(self):
+        index, cluster = self._memory.popitem(last=False)
+        self._used -= self._sizes.pop(index)
+        if self._offsets[index] >= 0:
+            return
+        if self._store is None:
+            self._store = tempfile.TemporaryFile(dir=self._tempdir, prefix="cdhit_collection_")
+        data = _pack_cluster(cluster)
+        self._store.seek(self._store_end)
+        self._store.write(data)
+        self._offsets[index] = self._store_end
+        self._lengths[index] = len(data)
+        self._store_end += len(data)
+        self._unflushed = True
+
+    def _load(self, index: int) -> Cluster:
+        if self._unflushed:
+            self._store.flush()
+            self._unflushed = False
+        self._store.seek(self._offsets[index])
+        return _unpack_cluster(self._store.read(self._lengths[index]), 0)[0]
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("cluster index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Cluster, List[Cluster]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._offsets)))]
+        index = self._index(index)
+        cluster = self._memory.get(index)
+        if cluster is not None:
+            self._memory.move_to_end(index)
+            return cluster
+        cluster = self._load(index)
+        self._keep(index, cluster)
+        return cluster
+
+    def __iter__(self) -> Iterator[Cluster]:
+        for index in range(len(self._offsets)):
+            cluster = self._memory.get(index)
+            yield cluster if cluster is not None else self._load(index)
+
+    def __repr__(self) -> str:
+        return f"ClusterCollection(len={len(self)}, spilled={self.spilled})"
+
+    def close(self):
+        """
+        Drop the clusters and delete the temporary file.
+        """
+        self._memory.clear()
+        self._sizes.clear()
+        self._used = 0
+        self._offsets = array("q")
+        self._lengths = array("Q")
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        self.close()
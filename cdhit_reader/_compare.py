@@ -1,12 +1,14 @@
-from email.policy import default
 import sys
 from statistics import mean
 
 import click
 
-from ._reader import read_cdhit
+from ._reader import Cluster, read_cdhit
 from ._version import __version__
+from ._writer import FastaWriter
 from xopen import xopen
+import copy
+import hashlib
 import os
 import tempfile
 import subprocess
@@ -38,10 +40,46 @@ def read_fasta(path):
                 seq += line
     yield name, comment, seq
 
-def relabel_fasta(path, prefix, outpath):
-    with xopen(outpath, "a") as out:
+def relabel_fasta(path, prefix, outpath, seen=None, duplicates=None):
+    """
+    Append the sequences of `path` to `outpath`, prefixing their names.
+
+    If `seen` (sequence digest -> name) and `duplicates` (name -> names)
+    are given, sequences identical to one already written are not written
+    again, but recorded as duplicates of the first one.
+    """
+    with FastaWriter(outpath, mode="a") as out:
         for name, comment, seq in read_fasta(path):
-            out.write(">{}{}{}{}\n{}\n".format(prefix, name, " " if len(comment) > 1 else "", comment, seq))
+            if not seq:
+                # Never clustered by cd-hit
+                continue
+            if seen is not None:
+                digest = hashlib.blake2b(seq.encode(), digest_size=16).digest()
+                exemplar = seen.get(digest)
+                if exemplar is not None:
+                    duplicates.setdefault(exemplar, []).append(prefix + name)
+                    continue
+                seen[digest] = prefix + name
+            out.write_record(prefix + name, seq, comment if len(comment) > 1 else None)
+
+def expand_cluster(cluster, duplicates):
+    """
+    Add back to a cluster the duplicates of its members, as
+    non-representative members with the same identity and strand.
+    """
+    sequences = []
+    for seq in cluster.sequences:
+        sequences.append(seq)
+        for name in duplicates.get(seq.name, []):
+            dup = copy.copy(seq)
+            dup.name = name
+            dup.is_ref = False
+            sequences.append(dup)
+    if len(sequences) == len(cluster.sequences):
+        return cluster
+    for i, seq in enumerate(sequences):
+        seq.id = i
+    return Cluster(cluster.name, sequences)
 
 def split_cluster(cluster, tag1, tag2):
     pool1, pool2 = [], []
@@ -61,8 +99,9 @@ def split_cluster(cluster, tag1, tag2):
 @click.option("--id", help="Identity threshold [default: 0.9]", default=0.95, type=float)
 @click.option("--type", type=click.STRING, help="Type of the sequences (nucl or prot)")
 @click.option("--tempdir",type=click.Path(exists=True), help="Temporary directory for intermediate files", default=tempfile.gettempdir())
+@click.option("--dedup/--no-dedup", default=True, help="Collapse identical sequences before running cd-hit [default: dedup]")
 @click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
-def compare(fasta1, fasta2, tag1: str, tag2: str, tempdir, type: str, id: float,verbose: bool):
+def compare(fasta1, fasta2, tag1: str, tag2: str, tempdir, type: str, id: float, dedup: bool, verbose: bool):
     """
     Compare FASTA files
 
@@ -105,12 +144,17 @@ def compare(fasta1, fasta2, tag1: str, tag2: str, tempdir, type: str, id: float,
     if verbose:
         print("Relabeling {} to {}".format(fasta1, fasta_file), file=sys.stderr)
     
-    relabel_fasta(fasta1, TAG1, fasta_file)
+    seen = {} if dedup else None
+    duplicates = {}
+    relabel_fasta(fasta1, TAG1, fasta_file, seen, duplicates)
 
     if verbose:
         print("Relabeling {} to {}".format(fasta2, fasta_file), file=sys.stderr)
     
-    relabel_fasta(fasta2, TAG2, fasta_file)
+    relabel_fasta(fasta2, TAG2, fasta_file, seen, duplicates)
+
+    if verbose and dedup:
+        print("Collapsed {} identical sequences".format(sum(len(d) for d in duplicates.values())), file=sys.stderr)
 
     tags = {
         TAG1: prefix1,
@@ -128,7 +172,7 @@ def compare(fasta1, fasta2, tag1: str, tag2: str, tempdir, type: str, id: float,
 
     stats = {TAG1: [], TAG2: [], "both": [], "multi": [], "dupl_" + TAG1: [],  "dupl_" + TAG2: []}
     for cluster in read_cdhit(clstr_file + ".clstr"):
-        
+        cluster = expand_cluster(cluster, duplicates)
         pool = (cluster.refname)[0:len(TAG1)]
         if pool != TAG1 and pool != TAG2:
             raise ValueError("Cluster {} does not start with {} or {}".format(cluster.refname, TAG1, TAG2))
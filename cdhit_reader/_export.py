@@ -0,0 +1,206 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import IO, Union
+import os
+import sqlite3
+import sys
+
+import click
+from xopen import xopen
+
+from ._reader import ClstrReader
+from ._version import __version__
+
+__all__ = ["export_tsv", "export_sqlite", "export"]
+
+TSV_HEADER = ["cluster_id", "cluster", "member_id", "name", "length", "identity", "is_representative", "strand"]
+
+_SCHEMA = """
+DROP TABLE IF EXISTS members;
+DROP TABLE IF EXISTS clusters;
+CREATE TABLE clusters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    representative TEXT,
+    size INTEGER NOT NULL
+);
+CREATE TABLE members (
+    cluster_id INTEGER NOT NULL REFERENCES clusters (id),
+    member_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    identity REAL NOT NULL,
+    is_representative INTEGER NOT NULL,
+    strand TEXT NOT NULL
+);
+"""
+
+_INDEXES = """
+CREATE INDEX members_cluster_id ON members (cluster_id);
+CREATE INDEX members_name ON members (name);
+CREATE INDEX clusters_representative ON clusters (representative);
+"""
+
+_PRAGMAS = [
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA locking_mode = EXCLUSIVE",
+]
+# Without a rollback journal a failed or interrupted load can leave the
+# database corrupt: only for files created by the export, deleted on error.
+_NEW_DATABASE_PRAGMAS = [
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+]
+# Existing databases keep their journal mode
+_EXISTING_DATABASE_PRAGMAS = [
+    "PRAGMA synchronous = NORMAL",
+]
+
+
+def export_tsv(
+    clstr: Union[str, Path, IO[str]], output: Union[str, Path, IO[str]], batch_size: int = 10000
+) -> int:
+    """
+    Write one row per cluster member to a tab-separated file.
+
+    Columns are ``cluster_id``, ``cluster``, ``member_id``, ``name``,
+    ``length``, ``identity``, ``is_representative`` and ``strand``, after a
+    header line.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    output
+        Output file path (compressed according to its extension) or IO stream.
+    batch_size
+        Number of rows formatted before each write.
+
+    Returns
+    -------
+    Number of members written.
+    """
+    out = xopen(output, "w") if isinstance(output, (str, Path)) else output
+    nrows = 0
+    try:
+        out.write("\t".join(TSV_HEADER) + "\n")
+        lines = []
+        with ClstrReader(clstr) as reader:
+            for n, cluster in enumerate(reader):
+                for seq in cluster.sequences:
+                    lines.append(
+                        f"{n}\t{cluster.name}\t{seq.id}\t{seq.name}\t{seq.length}\t{seq.identity}\t{int(seq.is_ref)}\t{seq.strand.value}\n"
+                    )
+                if len(lines) >= batch_size:
+                    out.write("".join(lines))
+                    nrows += len(lines)
+                    lines = []
+        out.write("".join(lines))
+        nrows += len(lines)
+    finally:
+        if out is not output:
+            out.close()
+    return nrows
+
+
+def export_sqlite(clstr: Union[str, Path, IO[str]], database: Union[str, Path], batch_size: int = 10000) -> int:
+    """
+    Load a clustering into the ``clusters`` and ``members`` tables of a
+    SQLite database.
+
+    Existing tables with these names are replaced. Rows are inserted in
+    batches within a single transaction, rolled back on error, and the
+    indexes on
+    ``members.cluster_id``, ``members.name`` and
+    ``clusters.representative`` are built once all rows are loaded.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    database
+        SQLite database path.
+    batch_size
+        Number of rows per ``executemany`` call.
+
+    Returns
+    -------
+    Number of members written.
+    """
+    new = not os.path.exists(database) or os.path.getsize(database) == 0
+    con = sqlite3.connect(str(database), isolation_level=None)
+    nrows = 0
+    try:
+        for pragma in _PRAGMAS + (_NEW_DATABASE_PRAGMAS if new else _EXISTING_DATABASE_PRAGMAS):
+            con.execute(pragma)
+        con.execute("BEGIN")
+        _create_schema(con)
+
+        clusters = []
+        members = []
+        with ClstrReader(clstr) as reader:
+            for n, cluster in enumerate(reader):
+                clusters.append((n, cluster.name, cluster.refname, len(cluster)))
+                for seq in cluster.sequences:
+                    members.append((n, seq.id, seq.name, seq.length, seq.identity, int(seq.is_ref), seq.strand.value))
+                if len(members) >= batch_size:
+                    nrows += _insert(con, clusters, members)
+                    clusters = []
+                    members = []
+        nrows += _insert(con, clusters, members)
+
+        for statement in _INDEXES.strip().splitlines():
+            con.execute(statement)
+        con.execute("COMMIT")
+    except BaseException:
+        if new:
+            con.close()
+            os.remove(database)
+        elif con.in_transaction:
+            con.execute("ROLLBACK")
+        raise
+    finally:
+        con.close()
+    return nrows
+
+
+def _create_schema(con: sqlite3.Connection):
+    for statement in _SCHEMA.split(";"):
+        if statement.strip():
+            con.execute(statement)
+
+
+def _insert(con: sqlite3.Connection, clusters, members) -> int:
+    con.executemany("INSERT INTO clusters VALUES (?, ?, ?, ?)", clusters)
+    con.executemany("INSERT INTO members VALUES (?, ?, ?, ?, ?, ?, ?)", members)
+    return len(members)
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option(__version__)
+@click.argument("clstr", type=click.Path(exists=True))
+@click.option("-o", "--output", required=True, type=click.Path(), help="Output file")
+@click.option(
+    "--format",
+    type=click.Choice(["tsv", "sqlite"]),
+    help="Output format [default: sqlite for .db/.sqlite outputs, tsv otherwise]",
+)
+@click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
+def export(clstr, output, format: str, verbose: bool):
+    """
+    Export the sequence to cluster mapping as a table
+
+    \b
+    Warning
+    -------
+    The commad line interface is in EXPERIMENTAL stage.
+    """
+    if format is None:
+        format = "sqlite" if output.endswith((".db", ".sqlite", ".sqlite3")) else "tsv"
+    if format == "sqlite":
+        nrows = export_sqlite(clstr, output)
+    else:
+        nrows = export_tsv(clstr, output)
+    if verbose:
+        print("Exported {} sequences to {}".format(nrows, output), file=sys.stderr)
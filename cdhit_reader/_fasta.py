@@ -2,10 +2,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import IO, Iterator, List, Union
 from enum import Enum
-from more_itertools import peekable
-from xopen import xopen
 import re
 
+from ._reader import ParsingError, ParsingReport, _Peekable, _byte_length, _check_policy, _open_text
+
 __all__ = ["Sequence", "FastaReader", "read_fasta"]
  
  
@@ -35,25 +35,36 @@ class FastaReader:
     """
     FASTA reader
     """    
-    def __init__(self, file: Union[str, Path, IO[str]], separator=" ", line_len=0):
+    def __init__(self, file: Union[str, Path, IO[str]], separator=" ", line_len=0, errors="strict"):
         """
         Parameters
         ----------
         file
             File path or IO stream.
+        errors
+            What to do with malformed records: ``strict`` raises a
+            `ParsingError`; ``skip`` drops them, counting them in `report`;
+            ``collect`` also keeps their errors in `report`. Reading resumes
+            at the next header. Defaults to ``strict``.
         """
+        _check_policy(errors)
         if isinstance(file, str):
             file = Path(file)
 
         if isinstance(file, Path):
-            file = xopen(file, "r")
+            file = _open_text(file)
 
         self.separator = separator
         self.line_len = line_len
         self._file = file
+        self._encoding = getattr(file, "encoding", None) or "utf-8"
         self._seq = ""
-        self._lines = peekable(line for line in file)
+        self._lines = _Peekable(file)
         self._line_number = 0
+        self._offset = 0
+        self._record_offset = 0
+        self._errors = errors
+        self.report = ParsingReport()
 
     def read_item(self) -> Sequence:
         """
@@ -63,11 +74,21 @@ class FastaReader:
         -------
         Next item.
         """
-        defline = self._next_defline()
-        name = defline.split(maxsplit=1)[0]
-        comment = defline.split(maxsplit=1)[1] if len(defline.split(maxsplit=1)) > 1 else None
-        sequence = self._next_sequences()
-        return Sequence(name, sequence, comment, separator=self.separator, line_length=self.line_len)
+        while True:
+            try:
+                defline = self._next_defline()
+                name = defline.split(maxsplit=1)[0]
+                comment = defline.split(maxsplit=1)[1] if len(defline.split(maxsplit=1)) > 1 else None
+                sequence = self._next_sequences()
+                return Sequence(name, sequence, comment, separator=self.separator, line_length=self.line_len)
+            except ParsingError as error:
+                error.offset = self._record_offset
+                if self._errors == "strict":
+                    raise
+                self.report.count += 1
+                if self._errors == "collect":
+                    self.report.errors.append(error)
+                self._resync()
 
     def read_items(self) -> List[Sequence]:
         """
@@ -88,34 +109,42 @@ class FastaReader:
     def _next_defline(self) -> str:
         while True:
             line = next(self._lines)
+            self._record_offset = self._offset
             self._line_number += 1
-            if line == "":
-                raise StopIteration
+            self._offset += _byte_length(line, self._encoding)
 
             line = line.strip()
             if line.startswith(">"):
+                if line == ">":
+                    raise ParsingError(self._line_number, "empty header")
                 return line[1:]
             if line != "":
-                raise "Invalid FASTA file"
+                raise ParsingError(self._line_number, "expected a header")
 
     def _next_sequences(self) -> str:
+        if not self._sequence_continues():
+            raise ParsingError(self._line_number, "record without sequence")
         seq = ""
         while True:
-            line = next(self._lines).strip()
-            
+            line = next(self._lines)
             self._line_number += 1
-            if line == "":
-                raise
-
-            line = line.strip()
-            if not line.startswith(">"):
-                seq += line
-                if self._sequence_continues():
-                    continue
+            self._offset += _byte_length(line, self._encoding)
+            seq += line.strip()
+            if not self._sequence_continues():
                 return seq
-            if line != "":
-                raise 
-     
+
+    def _resync(self):
+        # Skip to the next header
+        while True:
+            try:
+                line = self._lines.peek()
+            except StopIteration:
+                return
+            if line.lstrip().startswith(">"):
+                return
+            next(self._lines)
+            self._line_number += 1
+            self._offset += _byte_length(line, self._encoding)
 
     def _sequence_continues(self):
         try:
@@ -144,7 +173,7 @@ class FastaReader:
         del traceback
         self.close()
             
-def read_fasta(file: Union[str, Path, IO[str]], separator=" ", line_len = 0) -> FastaReader:
+def read_fasta(file: Union[str, Path, IO[str]], separator=" ", line_len = 0, errors="strict") -> FastaReader:
     """
     Open a FASTA file for reading.
 
@@ -152,9 +181,11 @@ def read_fasta(file: Union[str, Path, IO[str]], separator=" ", line_len = 0) ->
     ----------
     file
         File path or IO stream.
+    errors
+        Error policy: ``strict``, ``skip`` or ``collect``. See `FastaReader`.
 
     Returns
     -------
     FASTA reader.
     """
-    return FastaReader(file, separator=separator, line_len=line_len)
\ No newline at end of file
+    return FastaReader(file, separator=separator, line_len=line_len, errors=errors)
\ No newline at end of file
@@ -0,0 +1,230 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import reduce
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, List, Optional, Tuple, Union
+import io
+import os
+
+from ._reader import Cluster, ClstrReader, _is_plain_file, _xopen
+
+__all__ = ["map_clusters", "reduce_clusters"]
+
+_BLOCK_SIZE = 1 << 20
+
+# A batch is either a byte range of a plain file, read by the worker
+# itself, or the raw text of the batch clusters.
+Batch = Union[Tuple[str, int, int], str]
+
+
+def _byte_ranges(path: str, chunksize: int, block_size: int = _BLOCK_SIZE) -> Iterator[Tuple[str, int, int]]:
+    """
+    Split a plain file into byte ranges of `chunksize` clusters, only
+    counting header lines.
+    """
+    start = 0
+    nheaders = 0
+    offset = 0
+    with open(path, "rb") as fh:
+        # A virtual newline before the start of the file
+        prev = b"\n"
+        while True:
+            block = fh.read(block_size)
+            if not block:
+                break
+            # data[i] is at file offset offset - 1 + i
+            data = prev + block
+            count = data.count(b"\n>")
+            if nheaders + count <= chunksize:
+                nheaders += count
+            else:
+                pos = data.find(b"\n>")
+                while pos >= 0:
+                    nheaders += 1
+                    if nheaders > chunksize:
+                        boundary = offset + pos
+                        yield path, start, boundary
+                        start = boundary
+                        nheaders = 1
+                    pos = data.find(b"\n>", pos + 1)
+            prev = block[-1:]
+            offset += len(block)
+    if offset > start:
+        yield path, start, offset
+
+
+def _text_batches(file: Union[str, Path, IO[str]], chunksize: int) -> Iterator[str]:
+    """
+    Split a stream into the raw text of `chunksize` clusters.
+    """
+    stream = _xopen(Path(file), "r") if isinstance(file, (str, Path)) else file
+    try:
+        lines: List[str] = []
+        nheaders = 0
+        for line in stream:
+            if line.startswith(">"):
+                nheaders += 1
+                if nheaders > chunksize:
+                    yield "".join(lines)
+                    lines = []
+                    nheaders = 1
+            lines.append(line)
+        if lines:
+            yield "".join(lines)
+    finally:
+        if stream is not file:
+            stream.close()
+
+
+def _batches(file: Union[str, Path, IO[str]], chunksize: int) -> Iterator[Batch]:
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if _is_plain_file(file):
+        return _byte_ranges(str(file), chunksize)
+    return _text_batches(file, chunksize)
+
+
+def _clusters(batch: Batch) -> Iterator[Cluster]:
+    if isinstance(batch, tuple):
+        path, start, end = batch
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            batch = fh.read(end - start).decode()
+    return iter(ClstrReader(io.StringIO(batch)))
+
+
+def _map_batch(func: Callable[[Cluster], Any], batch: Batch) -> List[Any]:
+    return [func(cluster) for cluster in _clusters(batch)]
+
+
+def _reduce_batch(func: Callable[[Cluster], Any], reducer: Callable[[Any, Any], Any], batch: Batch) -> List[Any]:
+    # An empty list stands for a batch without clusters
+    results = map(func, _clusters(batch))
+    try:
+        first = next(results)
+    except StopIteration:
+        return []
+    return [reduce(reducer, results, first)]
+
+
+def _run(
+    task: Callable[..., List[Any]],
+    args: tuple,
+    file: Union[str, Path, IO[str]],
+    workers: Optional[int],
+    chunksize: int,
+    ordered: bool,
+) -> Iterator[Any]:
+    batches = _batches(file, chunksize)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for batch in batches:
+            yield from task(*args, batch)
+        return
+
+    # At most two batches per worker are in flight: reading the input
+    # waits for the results to be consumed.
+    max_pending = 2 * workers
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for batch in batches:
+            pending.append(executor.submit(task, *args, batch))
+            if len(pending) < max_pending:
+                continue
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+        while pending:
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def map_clusters(
+    file: Union[str, Path, IO[str]],
+    func: Callable[[Cluster], Any],
+    workers: Optional[int] = None,
+    chunksize: int = 1000,
+    ordered: bool = True,
+) -> Iterator[Any]:
+    """
+    Apply a function to every cluster of a CD-HIT file in worker processes.
+
+    Workers receive batches of `chunksize` clusters and parse them
+    themselves: byte ranges for plain files, raw text for compressed files
+    and streams. Results are yielded as they are consumed, with at most two
+    batches per worker in flight.
+
+    Parameters
+    ----------
+    file
+        File path or IO stream.
+    func
+        Function of a `Cluster`. It must be picklable, e.g. defined at the
+        top level of a module.
+    workers
+        Number of worker processes. Defaults to the number of CPUs; ``1``
+        runs in the current process.
+    chunksize
+        Number of clusters per batch. Defaults to ``1000``.
+    ordered
+        ``True`` to yield results in file order, ``False`` to yield them as
+        batches complete. Defaults to ``True``.
+
+    Returns
+    -------
+    Iterator over the results.
+    """
+    return _run(_map_batch, (func,), file, workers, chunksize, ordered)
+
+
+def reduce_clusters(
+    file: Union[str, Path, IO[str]],
+    func: Callable[[Cluster], Any],
+    reducer: Callable[[Any, Any], Any],
+    initial: Any,
+    workers: Optional[int] = None,
+    chunksize: int = 1000,
+) -> Any:
+    """
+    Map a function over the clusters of a CD-HIT file and combine the
+    results, in worker processes.
+
+    Each worker reduces its own batches, and the partial results are
+    combined in file order, so `reducer` must be associative.
+
+    Parameters
+    ----------
+    file
+        File path or IO stream.
+    func
+        Function of a `Cluster`; must be picklable.
+    reducer
+        Function combining two results; must be picklable.
+    initial
+        Initial value of the reduction.
+    workers
+        Number of worker processes. Defaults to the number of CPUs.
+    chunksize
+        Number of clusters per batch. Defaults to ``1000``.
+
+    Returns
+    -------
+    Reduced value.
+    """
+    return reduce(reducer, _run(_reduce_batch, (func, reducer), file, workers, chunksize, True), initial)
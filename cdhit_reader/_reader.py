@@ -1,12 +1,145 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import IO, Iterator, List, Union
+from typing import IO, TYPE_CHECKING, Callable, Iterator, List, Optional, Union
 from enum import Enum
-from more_itertools import peekable
-from xopen import xopen
+import io
+import os
 import re
+import time
+
+if TYPE_CHECKING:
+    from ._collection import ClusterCollection
+
+__all__ = ["ParsingError", "ParsingReport", "ClusterSequence", "Cluster", "ClstrReader", "read_cdhit", "SeqType", "Strand", "FastaReader", "read_fasta"]
+
+def _xopen(file: Path, mode: str, **kwargs) -> IO:
+    # xopen pulls in subprocess and the compression modules: import it on
+    # first use to keep ``import cdhit_reader`` fast.
+    from xopen import xopen
+
+    return xopen(file, mode, **kwargs)
+
+
+def _open_text(file: Path, follow: bool = False) -> IO[str]:
+    # Line endings are kept as they are (newline=""), so that summing the
+    # encoded lengths of the lines gives byte offsets.
+    raw = open(file, "rb") if follow else _xopen(file, "rb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+def _byte_length(line: str, encoding: str) -> int:
+    # isascii() is a flag lookup: no encoding on the common path
+    return len(line) if line.isascii() else len(line.encode(encoding, "replace"))
+
+
+_COMPRESSED_SUFFIXES = {".gz", ".bz2", ".xz", ".zst", ".zstd"}
+
+
+def _is_plain_file(file: Union[str, Path, IO[str]]) -> bool:
+    """
+    Whether `file` is the path of an uncompressed, hence seekable, file.
+    """
+    return isinstance(file, (str, Path)) and Path(file).suffix.lower() not in _COMPRESSED_SUFFIXES
+
+
+_EMPTY = object()
+
+
+class _Peekable:
+    """
+    Iterator with one item of look-ahead.
+    """
+
+    __slots__ = ("_iterator", "_next")
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._next = _EMPTY
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self._next
+        if item is _EMPTY:
+            return next(self._iterator)
+        self._next = _EMPTY
+        return item
+
+    def peek(self):
+        """
+        Next item, without consuming it. Raises ``StopIteration`` at the end.
+        """
+        if self._next is _EMPTY:
+            self._next = next(self._iterator)
+        return self._next
+
+
+def _follow(
+    file: IO[str], done: Callable[[], bool], poll_interval: float, max_interval: float, timeout: Optional[float]
+) -> Iterator[str]:
+    """
+    Yield the complete lines of a file that is still being written, waiting
+    with an exponential backoff at the end of the file until `done()` is
+    true or no data arrived for `timeout` seconds.
+    """
+    partial = ""
+    interval = poll_interval
+    last_data = time.monotonic()
+    stopping = False
+    while True:
+        line = file.readline()
+        if line:
+            if line.endswith("\n"):
+                yield partial + line
+                partial = ""
+            else:
+                partial += line
+            interval = poll_interval
+            last_data = time.monotonic()
+            continue
+        if stopping:
+            break
+        if done() or (timeout is not None and time.monotonic() - last_data >= timeout):
+            # Read once more: data may have been written just before the end
+            stopping = True
+            continue
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
+    if partial:
+        yield partial
+
+
+def _finished(producer, marker) -> Callable[[], bool]:
+    """
+    Build the end-of-input check for follow mode.
+    """
+
+    def process_exited() -> bool:
+        if hasattr(producer, "poll"):
+            return producer.poll() is not None
+        try:
+            # Reap the process if it is our child, or it stays a zombie
+            pid, _ = os.waitpid(producer, os.WNOHANG)
+            if pid != 0:
+                return True
+        except ChildProcessError:
+            pass
+        try:
+            os.kill(producer, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def done() -> bool:
+        if marker is not None and os.path.exists(marker):
+            return True
+        return producer is not None and process_exited()
+
+    return done
 
-__all__ = ["ParsingError", "ClusterSequence", "Cluster", "ClstrReader", "read_cdhit", "SeqType", "Strand", "FastaReader", "read_fasta"]
 
 class SeqType(Enum):
     """
@@ -30,15 +163,21 @@ class ParsingError(Exception):
     Parsing error.
     """
 
-    def __init__(self, line_number: int):
+    def __init__(self, line_number: int, message: Optional[str] = None, offset: Optional[int] = None):
         """
         Parameters
         ----------
         line_number
             Line number.
+        message
+            Description of the error.
+        offset
+            Offset of the start of the bad record.
         """
-        super().__init__(f"Line number {line_number}.")
+        super().__init__(f"Line number {line_number}." if message is None else f"Line number {line_number}: {message}")
         self._line_number = line_number
+        self.message = message
+        self.offset = offset
 
     @property
     def line_number(self) -> int:
@@ -51,6 +190,46 @@ class ParsingError(Exception):
         """
         return self._line_number
 
+
+ERROR_POLICIES = ["strict", "skip", "collect"]
+
+
+class ParsingReport:
+    """
+    Bad records found by a reader with the ``skip`` or ``collect`` error
+    policy.
+
+    Attributes
+    ----------
+    count: int
+        Number of bad records skipped.
+    errors: List[ParsingError]
+        ``collect`` policy: the error of each bad record, with its line
+        number and the byte offset of the start of the record in the
+        uncompressed file. For IO streams passed by the caller, offsets
+        count the text encoded with the stream's encoding: they match the
+        file if the stream keeps line endings as they are (``newline=""``).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors: List[ParsingError] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[ParsingError]:
+        return iter(self.errors)
+
+    def __repr__(self) -> str:
+        return f"ParsingReport(count={self.count})"
+
+
+def _check_policy(errors: str):
+    if errors not in ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy: {errors}")
+
+
 class ClusterSequence:
     """
     A single sequence of a cluster from line
@@ -91,6 +270,8 @@ class ClusterSequence:
 
 
         match = pattern.search(self.line)
+        if match is None:
+            raise ValueError(f"Invalid cluster member: {self.line!r}")
 
         self.seqtype = SeqType.PROTEIN if match["type"] == "aa" else SeqType.NT
         self.strand  = Strand.NONE if self.seqtype == SeqType.PROTEIN else Strand.PLUS
@@ -104,6 +285,8 @@ class ClusterSequence:
                 
             else:
                 attrs = attrpatt.match(match["attr"])
+                if attrs is None:
+                    raise ValueError(f"Invalid cluster member: {self.line!r}")
                 self.is_ref = False
                 self.identity = float(attrs["percent"])
                 self.strand = Strand.PLUS if attrs["strand"] == "+" else Strand.REVERSE if attrs["strand"] == "-" else Strand.NONE
@@ -161,11 +344,11 @@ class FastaReader:
             file = Path(file)
 
         if isinstance(file, Path):
-            file = xopen(file, "r")
+            file = _xopen(file, "r")
 
         self._file = file
         self._seq = ""
-        self._lines = peekable(line for line in file)
+        self._lines = _Peekable(file)
         self._line_number = 0
 
     def read_item(self) -> Cluster:
@@ -260,23 +443,67 @@ class ClstrReader:
     CD-HIT (Clstr) reader.
     """
 
-    def __init__(self, file: Union[str, Path, IO[str]]):
+    def __init__(
+        self,
+        file: Union[str, Path, IO[str]],
+        follow: bool = False,
+        producer=None,
+        marker: Union[str, Path, None] = None,
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.05,
+        max_interval: float = 1.0,
+        errors: str = "strict",
+    ):
         """
         Parameters
         ----------
         file
             File path or IO stream.
+        follow
+            ``True`` to read a file that is still being written, such as the
+            output of a running cd-hit: at the end of the file, wait for more
+            data instead of stopping. Clusters are only returned once
+            complete. Defaults to ``False``.
+        producer
+            Follow mode: stop once this process has exited. Either a process
+            id or a `subprocess.Popen` object.
+        marker
+            Follow mode: stop once this file exists.
+        timeout
+            Follow mode: stop after this many seconds without new data.
+            Without `producer`, `marker` or `timeout`, follow indefinitely.
+        poll_interval
+            Follow mode: initial wait between reads at the end of the file,
+            doubled up to `max_interval` while no data arrives.
+        max_interval
+            Follow mode: maximum wait between reads, in seconds.
+        errors
+            What to do with malformed clusters: ``strict`` raises a
+            `ParsingError`; ``skip`` drops them, counting them in `report`;
+            ``collect`` also keeps their errors in `report`. Reading resumes
+            at the next cluster header. Defaults to ``strict``.
         """
+        _check_policy(errors)
         if isinstance(file, str):
             file = Path(file)
 
         if isinstance(file, Path):
-            file = xopen(file, "r")
+            # Compressed files cannot be followed while being written
+            file = _open_text(file, follow)
 
         self._file = file
+        self._encoding = getattr(file, "encoding", None) or "utf-8"
         self._clusterSequences = []
-        self._lines = peekable(line for line in file)
+        if follow:
+            lines = _follow(file, _finished(producer, marker), poll_interval, max_interval, timeout)
+        else:
+            lines = file
+        self._lines = _Peekable(lines)
         self._line_number = 0
+        self._offset = 0
+        self._record_offset = 0
+        self._errors = errors
+        self.report = ParsingReport()
 
     def read_item(self) -> Cluster:
         """
@@ -286,19 +513,40 @@ class ClstrReader:
         -------
         Next item.
         """
-        defline = self._next_defline()
-        sequences = self._next_sequences()
-        return Cluster(defline, sequences)
-
-    def read_items(self) -> List[Cluster]:
+        while True:
+            try:
+                defline = self._next_defline()
+                sequences = self._next_sequences()
+                return Cluster(defline, sequences)
+            except ParsingError as error:
+                error.offset = self._record_offset
+                if self._errors == "strict":
+                    raise
+                self.report.count += 1
+                if self._errors == "collect":
+                    self.report.errors.append(error)
+                self._resync()
+
+    def read_items(self, max_memory: Optional[int] = None) -> Union[List[Cluster], ClusterCollection]:
         """
         Get the list of all items.
 
+        Parameters
+        ----------
+        max_memory
+            Approximate memory budget in bytes. If given, return a
+            `ClusterCollection` that moves the clusters beyond the budget to
+            a temporary file. Defaults to a plain list.
+
         Returns
         -------
         List of all items.
         """
-        return list(self)
+        if max_memory is None:
+            return list(self)
+        from ._collection import ClusterCollection
+
+        return ClusterCollection(self, max_memory=max_memory)
 
     def close(self):
         """
@@ -309,34 +557,48 @@ class ClstrReader:
     def _next_defline(self) -> str:
         while True:
             line = next(self._lines)
+            self._record_offset = self._offset
             self._line_number += 1
-            if line == "":
-                raise StopIteration
+            self._offset += _byte_length(line, self._encoding)
 
             line = line.strip()
             if line.startswith(">"):
                 return line[1:]
             if line != "":
-                raise ParsingError(self._line_number)
+                raise ParsingError(self._line_number, "expected a cluster header")
 
-    def _next_sequences(self) -> str:
+    def _next_sequences(self) -> List[ClusterSequence]:
+        try:
+            following = self._lines.peek()
+        except StopIteration:
+            # Truncated file, ending with a header
+            following = ">"
+        if following.lstrip().startswith(">"):
+            raise ParsingError(self._line_number, "cluster without members")
         clusterSequences = []
         while True:
             line = next(self._lines)
-            
             self._line_number += 1
-            if line == "":
-                raise ParsingError(self._line_number)
-
-            line = line.strip()
-            if not line.startswith(">"):
-                clusterSequences.append( ClusterSequence(line.strip()) )
-                if self._sequence_continues():
-                    continue
+            self._offset += _byte_length(line, self._encoding)
+            try:
+                clusterSequences.append(ClusterSequence(line.strip()))
+            except ValueError as error:
+                raise ParsingError(self._line_number, str(error)) from None
+            if not self._sequence_continues():
                 return clusterSequences
-            if line != "":
-                raise ParsingError(self._line_number)
-     
+
+    def _resync(self):
+        # Skip to the next cluster header
+        while True:
+            try:
+                line = self._lines.peek()
+            except StopIteration:
+                return
+            if line.lstrip().startswith(">"):
+                return
+            next(self._lines)
+            self._line_number += 1
+            self._offset += _byte_length(line, self._encoding)
 
     def _sequence_continues(self):
         try:
@@ -366,7 +628,7 @@ class ClstrReader:
         self.close()
 
 
-def read_cdhit(file: Union[str, Path, IO[str]]) -> ClstrReader:
+def read_cdhit(file: Union[str, Path, IO[str]], cache: bool = False, cache_dir: Union[str, Path, None] = None, **kwargs):
     """
     Open a CD-HIT file for reading.
 
@@ -374,12 +636,27 @@ def read_cdhit(file: Union[str, Path, IO[str]]) -> ClstrReader:
     ----------
     file
         File path or IO stream.
+    cache
+        ``True`` to read through a binary snapshot of the parsed file, built
+        on first use and reused while the file is unchanged. Defaults to ``False``.
+    cache_dir
+        Snapshot directory; implies ``cache=True``. See `ClstrCache`.
+    kwargs
+        Further `ClstrReader` options, such as ``follow=True``.
 
     Returns
     -------
     CD-HIT (Clstr) reader.
     """
-    return ClstrReader(file)
+    if cache or cache_dir is not None:
+        if not isinstance(file, (str, Path)):
+            raise ValueError("Caching requires a file path.")
+        if kwargs:
+            raise ValueError("Reader options cannot be combined with caching.")
+        from ._cache import ClstrCache
+
+        return ClstrCache(cache_dir).open(file)
+    return ClstrReader(file, **kwargs)
 
 
 def read_fasta(file: Union[str, Path, IO[str]]) -> FastaReader:
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Sequence, Tuple, Union
+import io
+import mmap
+import random
+
+from ._reader import Cluster, ClstrReader, _is_plain_file
+
+__all__ = ["ClusterIndex", "sample_clusters"]
+
+
+class ClusterIndex:
+    """
+    Byte offsets and sizes of the clusters of an uncompressed CD-HIT file,
+    for random access without parsing the whole file.
+
+    Building the index only searches the file for header lines.
+    """
+
+    def __init__(self, file: Union[str, Path]):
+        """
+        Parameters
+        ----------
+        file
+            File path.
+        """
+        self._path = str(file)
+        self.offsets = array("Q")
+        self.sizes = array("I")
+        with open(self._path, "rb") as fh:
+            fh.seek(0, 2)
+            self._end = fh.tell()
+            if self._end == 0:
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:1] == b">":
+                    pos = 0
+                else:
+                    pos = mm.find(b"\n>")
+                    if pos >= 0:
+                        pos += 1
+                while pos >= 0:
+                    following = mm.find(b"\n>", pos)
+                    end = following + 1 if following >= 0 else self._end
+                    # Member lines: newlines after the header line
+                    self.offsets.append(pos)
+                    self.sizes.append(mm[pos:end].rstrip(b"\n").count(b"\n"))
+                    pos = end if following >= 0 else -1
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def read(self, index: int) -> Cluster:
+        """
+        Parse a single cluster.
+
+        Parameters
+        ----------
+        index
+            Cluster position in the file.
+
+        Returns
+        -------
+        Cluster.
+        """
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else self._end
+        with open(self._path, "rb") as fh:
+            fh.seek(start)
+            text = fh.read(end - start).decode()
+        return next(iter(ClstrReader(io.StringIO(text))))
+
+
+def _stratum(size: int, strata: Optional[Sequence[int]]) -> int:
+    if strata is None:
+        return 0
+    return bisect_right(strata, size) - 1
+
+
+def sample_clusters(
+    file: Union[str, Path, IO[str]],
+    n: int,
+    seed: Optional[int] = None,
+    strata: Optional[Sequence[int]] = None,
+) -> List[Cluster]:
+    """
+    Draw a uniform random sample of clusters, optionally stratified by size.
+
+    Uncompressed files are indexed and only the sampled clusters are
+    parsed. Compressed files and streams are read once, with reservoir
+    sampling.
+
+    Parameters
+    ----------
+    file
+        File path or IO stream.
+    n
+        Number of clusters to draw, per stratum if `strata` is given.
+    seed
+        Random seed, for reproducible samples.
+    strata
+        Increasing lower bounds of the size strata: ``[1, 2, 10]`` draws `n`
+        singletons, `n` clusters of 2 to 9 members and `n` clusters of 10
+        or more. Clusters smaller than the first bound are never drawn.
+
+    Returns
+    -------
+    Sampled clusters, in file order.
+    """
+    rng = random.Random(seed)
+    if strata is not None:
+        strata = sorted(strata)
+
+    if _is_plain_file(file):
+        index = ClusterIndex(file)
+        if strata is None:
+            groups = {0: range(len(index))}
+        else:
+            groups = {}
+            for i, size in enumerate(index.sizes):
+                stratum = _stratum(size, strata)
+                if stratum >= 0:
+                    groups.setdefault(stratum, array("Q")).append(i)
+        chosen = []
+        for stratum in sorted(groups):
+            members = groups[stratum]
+            # Sample positions: arrays are not sequences for random.sample
+            # before Python 3.10
+            chosen.extend(members[i] for i in rng.sample(range(len(members)), min(n, len(members))))
+        return [index.read(i) for i in sorted(chosen)]
+
+    reservoirs: Dict[int, List[Tuple[int, Cluster]]] = {}
+    seen: Dict[int, int] = {}
+    with ClstrReader(file) as reader:
+        for i, cluster in enumerate(reader):
+            stratum = _stratum(len(cluster), strata)
+            if stratum < 0:
+                continue
+            reservoir = reservoirs.setdefault(stratum, [])
+            count = seen[stratum] = seen.get(stratum, 0) + 1
+            if len(reservoir) < n:
+                reservoir.append((i, cluster))
+            else:
+                j = rng.randrange(count)
+                if j < n:
+                    reservoir[j] = (i, cluster)
+    sample = [item for reservoir in reservoirs.values() for item in reservoir]
+    return [cluster for _, cluster in sorted(sample, key=lambda item: item[0])]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+from heapq import merge
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+import os
+import pickle
+import sys
+import tempfile
+
+import click
+
+from ._reader import ClstrReader, _xopen
+from ._version import __version__
+
+__all__ = ["sort_clusters", "sort"]
+
+SORT_KEYS = ["size", "name", "input"]
+
+# Rough per-record overhead of the in-memory tuples, on top of the text
+_RECORD_OVERHEAD = 200
+# Maximum number of runs merged at once
+_FAN_IN = 64
+
+# (sort key, member lines without their ids)
+Record = Tuple[tuple, List[str]]
+
+
+def _record_size(record: Record) -> int:
+    return _RECORD_OVERHEAD + sum(map(len, record[1]))
+
+
+def _write_run(records: Iterable[Record], directory: str, batch_memory: int) -> str:
+    """
+    Write sorted records to a temporary run, in pickled batches of about
+    `batch_memory` bytes: the memory needed to read the run back.
+    """
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with os.fdopen(fd, "wb") as out:
+        batch = []
+        used = 0
+        for record in records:
+            batch.append(record)
+            used += _record_size(record)
+            if used >= batch_memory:
+                pickle.dump(batch, out, protocol=pickle.HIGHEST_PROTOCOL)
+                batch = []
+                used = 0
+        if batch:
+            pickle.dump(batch, out, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Iterator[Record]:
+    with open(path, "rb") as fh:
+        while True:
+            try:
+                records = pickle.load(fh)
+            except EOFError:
+                return
+            yield from records
+
+
+def _merge(runs: List[str], reverse: bool) -> Iterator[Record]:
+    return merge(*(_read_run(run) for run in runs), key=lambda record: record[0], reverse=reverse)
+
+
+def _merge_runs(runs: List[str], directory: str, reverse: bool, fan_in: int, batch_memory: int) -> List[str]:
+    """
+    Merge runs in passes of at most `fan_in` runs, until at most `fan_in`
+    are left, bounding the number of open files and read batches.
+    """
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            if len(group) == 1:
+                merged.extend(group)
+                continue
+            merged.append(_write_run(_merge(group, reverse), directory, batch_memory))
+            for run in group:
+                os.remove(run)
+        runs = merged
+    return runs
+
+
+def sort_clusters(
+    clstr: Union[str, Path, IO[str]],
+    output: Union[str, Path, IO[str]],
+    by: str = "size",
+    reverse: bool = False,
+    min_size: int = 1,
+    max_memory: int = 256 << 20,
+    tempdir: Optional[Union[str, Path]] = None,
+    fan_in: int = _FAN_IN,
+) -> int:
+    """
+    Sort the clusters of a CD-HIT file, using temporary files beyond a
+    memory budget.
+
+    Clusters are collected until `max_memory` is reached, then sorted and
+    written to a temporary run; runs are merged into the output, in several
+    passes if there are more than `fan_in`. Clusters and members are
+    renumbered from zero, and sorting is stable.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    output
+        Output file path (compressed according to its extension) or IO stream.
+    by
+        Sort key: ``size`` (number of members), ``name`` (representative
+        name) or ``input`` (keep the input order, to filter and renumber).
+        Defaults to ``size``.
+    reverse
+        ``True`` for descending order. Defaults to ``False``.
+    min_size
+        Drop clusters with fewer members. Defaults to ``1``.
+    max_memory
+        Approximate memory budget for the in-memory runs, in bytes.
+    tempdir
+        Directory for the temporary runs. Defaults to the system one.
+    fan_in
+        Maximum number of runs merged at once, and so of temporary files
+        open at once. Each is read in batches of about ``max_memory /
+        fan_in`` bytes. Defaults to ``64``.
+
+    Returns
+    -------
+    Number of clusters written.
+    """
+    if by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {by}")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    batch_memory = max(1, max_memory // fan_in)
+    # The input position breaks ties, keeping input order also when reversed
+    sign = -1 if reverse else 1
+
+    with tempfile.TemporaryDirectory(dir=tempdir, prefix="cdhit_sort_") as directory:
+        runs = []
+        records: List[Record] = []
+        used = 0
+        with ClstrReader(clstr) as reader:
+            for n, cluster in enumerate(reader):
+                if len(cluster) < min_size:
+                    continue
+                if by == "size":
+                    key = (len(cluster), sign * n)
+                elif by == "name":
+                    key = (cluster.refname or "", sign * n)
+                else:
+                    key = (n,)
+                members = [seq.line.split(None, 1)[1] for seq in cluster.sequences]
+                records.append((key, members))
+                used += _record_size(records[-1])
+                if used >= max_memory:
+                    records.sort(key=lambda record: record[0], reverse=reverse)
+                    runs.append(_write_run(records, directory, batch_memory))
+                    records = []
+                    used = 0
+        records.sort(key=lambda record: record[0], reverse=reverse)
+
+        if runs:
+            if records:
+                runs.append(_write_run(records, directory, batch_memory))
+                records = []
+            runs = _merge_runs(runs, directory, reverse, fan_in, batch_memory)
+            ordered = _merge(runs, reverse)
+        else:
+            ordered = iter(records)
+
+        out = _xopen(Path(output), "w") if isinstance(output, (str, Path)) else output
+        nclusters = 0
+        try:
+            for _, members in ordered:
+                out.write(f">Cluster {nclusters}\n")
+                out.write("".join(f"{i}\t{member}\n" for i, member in enumerate(members)))
+                nclusters += 1
+        finally:
+            if out is not output:
+                out.close()
+    return nclusters
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option(__version__)
+@click.argument("clstr", type=click.Path(exists=True))
+@click.option("-o", "--output", required=True, type=click.Path(), help="Output CD-HIT file")
+@click.option("--by", type=click.Choice(SORT_KEYS), default="size", show_default=True, help="Sort key")
+@click.option("--reverse", default=False, is_flag=True, help="Sort in descending order")
+@click.option("--min-size", default=1, show_default=True, help="Drop clusters with fewer members")
+@click.option("--max-memory", default=256, show_default=True, help="Memory budget in MB")
+@click.option("--tempdir", type=click.Path(exists=True), help="Directory for temporary files")
+@click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
+def sort(clstr, output, by: str, reverse: bool, min_size: int, max_memory: int, tempdir, verbose: bool):
+    """
+    Sort, filter and renumber the clusters of a CLSTR file
+
+    \b
+    Warning
+    -------
+    The commad line interface is in EXPERIMENTAL stage.
+    """
+    nclusters = sort_clusters(
+        clstr, output, by=by, reverse=reverse, min_size=min_size, max_memory=max_memory << 20, tempdir=tempdir
+    )
+    if verbose:
+        print("Wrote {} clusters to {}".format(nclusters, output), file=sys.stderr)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Dict, Optional, Union
+import os
+import sys
+import warnings
+
+import click
+
+from ._fasta import FastaReader
+from ._reader import ClstrReader
+from ._version import __version__
+from ._writer import FastaWriter
+
+__all__ = ["split_clusters", "split"]
+
+COMPRESSIONS = ["gz", "bz2", "xz", "zst"]
+
+
+class _HandlePool:
+    """
+    Bounded pool of open FASTA writers, closing the least recently used one
+    when the limit is reached. Files are truncated the first time they are
+    opened, and appended to when reopened.
+    """
+
+    def __init__(self, max_open: int, line_length: int = 0, buffer_size: int = 1 << 16):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+        self.max_open = max_open
+        self.line_length = line_length
+        self.buffer_size = buffer_size
+        self._handles: OrderedDict[str, FastaWriter] = OrderedDict()
+        self._opened = set()
+
+    def get(self, path: str) -> FastaWriter:
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+
+        if len(self._handles) >= self.max_open:
+            self._handles.popitem(last=False)[1].close()
+        mode = "a" if path in self._opened else "w"
+        # threads=0: in-process compression, no helper process per file
+        handle = FastaWriter(path, line_length=self.line_length, buffer_size=self.buffer_size, threads=0, mode=mode)
+        self._opened.add(path)
+        self._handles[path] = handle
+        return handle
+
+    def close(self):
+        while self._handles:
+            self._handles.popitem(last=False)[1].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        self.close()
+
+
+def split_clusters(
+    clstr: Union[str, Path, IO[str]],
+    fasta: Union[str, Path, IO[str]],
+    outdir: Union[str, Path],
+    min_size: int = 1,
+    max_open: int = 256,
+    compress: Optional[str] = None,
+    prefix: str = "cluster_",
+    line_len: int = 0,
+) -> Dict[int, int]:
+    """
+    Write the members of each cluster to their own FASTA file.
+
+    The FASTA file is read once; records are routed to
+    ``<outdir>/<prefix><cluster number>.fa`` through a bounded pool of
+    open files. Sequence names are matched against the (possibly truncated)
+    names reported in the CD-HIT file: a warning reports the cluster members
+    never found in the FASTA file.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    fasta
+        FASTA file path or IO stream with the clustered sequences.
+    outdir
+        Output directory, created if missing.
+    min_size
+        Skip clusters with fewer members. Defaults to ``1``.
+    max_open
+        Maximum number of output files open at once. Defaults to ``256``.
+    compress
+        Output compression: one of ``gz``, ``bz2``, ``xz``, ``zst``. Defaults
+        to no compression.
+    prefix
+        Output file name prefix. Defaults to ``cluster_``.
+    line_len
+        Sequence line width, ``0`` to disable wrapping. Defaults to ``0``.
+
+    Returns
+    -------
+    Number of sequences written per cluster number.
+    """
+    if compress is not None and compress not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compress}")
+
+    seqcluster = {}
+    with ClstrReader(clstr) as reader:
+        for n, cluster in enumerate(reader):
+            if len(cluster) < min_size:
+                continue
+            for seq in cluster.sequences:
+                seqcluster[seq.name] = n
+
+    os.makedirs(outdir, exist_ok=True)
+    suffix = ".fa" + ("." + compress if compress else "")
+    counts: Dict[int, int] = {}
+    found = set()
+    with _HandlePool(max_open, line_length=line_len) as pool, FastaReader(fasta) as sequences:
+        for seq in sequences:
+            n = seqcluster.get(seq.name)
+            if n is None:
+                continue
+            found.add(seq.name)
+            pool.get(os.path.join(outdir, f"{prefix}{n}{suffix}")).write(seq)
+            counts[n] = counts.get(n, 0) + 1
+    if len(found) < len(seqcluster):
+        missing = len(seqcluster) - len(found)
+        warnings.warn(
+            f"{missing} of {len(seqcluster)} cluster members not found in the FASTA file "
+            "(were names truncated by cd-hit -d?)",
+            stacklevel=2,
+        )
+    return counts
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option(__version__)
+@click.argument("clstr", type=click.Path(exists=True))
+@click.argument("fasta", type=click.Path(exists=True))
+@click.option("-o", "--outdir", required=True, type=click.Path(file_okay=False), help="Output directory")
+@click.option("--min-size", default=1, show_default=True, help="Skip clusters with fewer members")
+@click.option("--max-open", default=256, show_default=True, help="Maximum number of open output files")
+@click.option("--compress", type=click.Choice(COMPRESSIONS), help="Compress the output files")
+@click.option("--prefix", default="cluster_", show_default=True, help="Output file name prefix")
+@click.option("--line-len", default=0, show_default=True, help="Sequence line width (0: no wrapping)")
+@click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
+def split(clstr, fasta, outdir, min_size: int, max_open: int, compress: str, prefix: str, line_len: int, verbose: bool):
+    """
+    Split a FASTA file into one file per cluster
+
+    \b
+    Warning
+    -------
+    The commad line interface is in EXPERIMENTAL stage.
+    """
+    counts = split_clusters(
+        clstr, fasta, outdir, min_size=min_size, max_open=max_open, compress=compress, prefix=prefix, line_len=line_len
+    )
+    if verbose:
+        print("Wrote {} sequences to {} files in {}".format(sum(counts.values()), len(counts), outdir), file=sys.stderr)
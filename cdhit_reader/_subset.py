@@ -0,0 +1,289 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from pathlib import Path
+from typing import IO, Container, Iterable, Optional, Union
+import hashlib
+import sys
+import warnings
+
+import click
+from xopen import xopen
+
+from ._reader import ClstrReader
+from ._version import __version__
+from ._writer import FastaWriter
+
+__all__ = ["NameSet", "representatives", "cluster_members", "subset_fasta", "subset"]
+
+_BLOCK_SIZE = 1 << 20
+# Hashes sorted at once without NumPy
+_SORT_CHUNK = 1 << 16
+
+
+def _hash(name: Union[str, bytes]) -> int:
+    if isinstance(name, str):
+        name = name.encode()
+    # A fixed 64-bit key, whatever the width of the built-in hash()
+    return int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), "little")
+
+
+def _sorted_unique(hashes: array) -> array:
+    """
+    Sort and deduplicate an array of hashes, without building Python
+    objects for all of them at once.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    result = array("Q")
+    if np is not None:
+        if hashes:
+            # Sort in place, and copy out the first of each run of equal hashes
+            view = np.frombuffer(hashes, dtype=np.uint64)
+            view.sort()
+            keep = np.empty(len(view), dtype=bool)
+            keep[0] = True
+            np.not_equal(view[1:], view[:-1], out=keep[1:])
+            result.frombytes(view[keep].view(np.uint8))
+        return result
+
+    runs = [array("Q", sorted(hashes[i:i + _SORT_CHUNK])) for i in range(0, len(hashes), _SORT_CHUNK)]
+    previous = None
+    for h in merge(*runs):
+        if h != previous:
+            result.append(h)
+            previous = h
+    return result
+
+
+class NameSet:
+    """
+    Compact, read-only set of sequence names.
+
+    Names are stored as a sorted array of 64-bit hashes (8 bytes per name),
+    so membership tests can report a false positive with probability of
+    about ``len(names) / 2**64``. Use a `set` of ``bytes`` instead where
+    exact matching is required.
+    """
+
+    def __init__(self, names: Iterable[Union[str, bytes]]):
+        """
+        Parameters
+        ----------
+        names
+            Sequence names.
+        """
+        hashes = array("Q")
+        for name in names:
+            hashes.append(_hash(name))
+        self._hashes = _sorted_unique(hashes)
+
+    def _find(self, name: Union[str, bytes]) -> int:
+        h = _hash(name)
+        i = bisect_left(self._hashes, h)
+        return i if i < len(self._hashes) and self._hashes[i] == h else -1
+
+    def __contains__(self, name: Union[str, bytes]) -> bool:
+        return self._find(name) >= 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+def representatives(clstr: Union[str, Path, IO[str]]) -> NameSet:
+    """
+    Names of the representative sequences of a clustering.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+
+    Returns
+    -------
+    Set of names.
+    """
+    with ClstrReader(clstr) as reader:
+        return NameSet(cluster.refname for cluster in reader if cluster.refname is not None)
+
+
+def cluster_members(clstr: Union[str, Path, IO[str]], min_size: int = 1, max_size: Optional[int] = None) -> NameSet:
+    """
+    Names of the members of clusters within a size range.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    min_size
+        Minimum cluster size. Defaults to ``1``.
+    max_size
+        Maximum cluster size. Defaults to no limit.
+
+    Returns
+    -------
+    Set of names.
+    """
+    with ClstrReader(clstr) as reader:
+        return NameSet(
+            seq.name
+            for cluster in reader
+            if len(cluster) >= min_size and (max_size is None or len(cluster) <= max_size)
+            for seq in cluster.sequences
+        )
+
+
+class _Matches:
+    """
+    Membership tests against `names`, remembering the distinct names found.
+    """
+
+    def __init__(self, names: Container[bytes]):
+        self._names = names
+        self._seen = bytearray(len(names)) if isinstance(names, NameSet) else set()
+
+    def __contains__(self, name: bytes) -> bool:
+        if isinstance(self._seen, bytearray):
+            i = self._names._find(name)
+            if i < 0:
+                return False
+            self._seen[i] = 1
+            return True
+        if name not in self._names:
+            return False
+        self._seen.add(name)
+        return True
+
+    def found(self) -> int:
+        return self._seen.count(1) if isinstance(self._seen, bytearray) else len(self._seen)
+
+
+def _record_name(header: bytes) -> bytes:
+    fields = header[1:].split(None, 1)
+    return fields[0] if fields else b""
+
+
+def subset_fasta(
+    fasta: Union[str, Path, IO[bytes]],
+    names: Container[bytes],
+    output: Union[str, Path, IO[bytes]],
+    block_size: int = _BLOCK_SIZE,
+    threads: Optional[int] = None,
+) -> int:
+    """
+    Copy the FASTA records whose name is in `names`.
+
+    Records are copied verbatim, in blocks, without being parsed into
+    `Sequence` objects. A warning reports the names never found, e.g.
+    because cd-hit truncated them in the CD-HIT file (option ``-d``).
+
+    Parameters
+    ----------
+    fasta
+        FASTA file path or binary IO stream.
+    names
+        Names to keep, tested as ``bytes``: a `NameSet` or any container.
+    output
+        Output file path (compressed according to its extension) or binary
+        IO stream.
+    block_size
+        Read size in bytes.
+    threads
+        Compression threads for compressed output. Defaults to xopen's
+        choice.
+
+    Returns
+    -------
+    Number of records written.
+    """
+    src = xopen(fasta, "rb") if isinstance(fasta, (str, Path)) else fasta
+    try:
+        matches = _Matches(names)
+        with FastaWriter(output, buffer_size=block_size, threads=threads) as dst:
+            nrecords = _copy_records(src, dst, matches, block_size)
+    finally:
+        if src is not fasta:
+            src.close()
+    if hasattr(names, "__len__") and matches.found() < len(names):
+        missing = len(names) - matches.found()
+        warnings.warn(f"{missing} of {len(names)} names not found in the FASTA file", stacklevel=2)
+    return nrecords
+
+
+def _copy_records(src: IO[bytes], dst: FastaWriter, names: Container[bytes], block_size: int) -> int:
+    nrecords = 0
+    keep = False
+    carry = b""
+    line_start = True
+    while True:
+        block = src.read(block_size)
+        if not block:
+            break
+        data = carry + block if carry else block
+        view = memoryview(data)
+        line_start = line_start or bool(carry)
+        carry = b""
+        start = 0
+
+        if line_start and data[:1] == b">":
+            header = 0
+        else:
+            header = data.find(b"\n>")
+            header = header + 1 if header >= 0 else -1
+        while header >= 0:
+            if keep:
+                dst.write_raw(view[start:header])
+            start = header
+            end = data.find(b"\n", header)
+            if end < 0:
+                # Header line continues in the next block
+                carry = data[header:]
+                keep = False
+                break
+            keep = _record_name(data[header:end]) in names
+            nrecords += keep
+            header = data.find(b"\n>", end)
+            header = header + 1 if header >= 0 else -1
+
+        if carry:
+            line_start = True
+        else:
+            if keep:
+                dst.write_raw(view[start:])
+            line_start = data.endswith(b"\n")
+
+    if carry and _record_name(carry) in names:
+        dst.write_raw(carry)
+        nrecords += 1
+    return nrecords
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option(__version__)
+@click.argument("clstr", type=click.Path(exists=True))
+@click.argument("fasta", type=click.Path(exists=True))
+@click.option("-o", "--output", required=True, type=click.Path(), help="Output FASTA file")
+@click.option("--representatives", "reps", default=False, is_flag=True, help="Only keep representative sequences")
+@click.option("--min-size", default=1, show_default=True, help="Only keep members of clusters with at least this size")
+@click.option("--max-size", type=int, help="Only keep members of clusters with at most this size")
+@click.option("--threads", type=int, help="Compression threads for compressed output")
+@click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
+def subset(clstr, fasta, output, reps: bool, min_size: int, max_size: int, threads: int, verbose: bool):
+    """
+    Extract representatives or members of selected clusters from a FASTA file
+
+    \b
+    Warning
+    -------
+    The commad line interface is in EXPERIMENTAL stage.
+    """
+    if reps:
+        names = representatives(clstr)
+    else:
+        names = cluster_members(clstr, min_size=min_size, max_size=max_size)
+    nrecords = subset_fasta(fasta, names, output, threads=threads)
+    if verbose:
+        print("Wrote {} of {} selected sequences to {}".format(nrecords, len(names), output), file=sys.stderr)
@@ -0,0 +1,253 @@
+from __future__ import annotations
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional, Tuple, Union
+import json
+import sys
+
+import click
+from xopen import xopen
+
+from ._reader import ClstrReader
+from ._version import __version__
+
+__all__ = ["ClusterTable", "cluster_table", "sample_parser", "table"]
+
+SampleParser = Callable[[str], Tuple[str, int]]
+
+
+def sample_parser(
+    separator: Optional[str] = "_", field: int = 0, key: Optional[str] = None, size_key: Optional[str] = "size"
+) -> SampleParser:
+    """
+    Build a parser of sample ids and abundances from sequence names.
+
+    Names may carry ``;key=value`` annotations, as in
+    ``read1;sample=S1;size=12;``.
+
+    Parameters
+    ----------
+    separator
+        Separator splitting the sample id from the rest of the name, as in
+        ``S1_read1``. Defaults to ``_``.
+    field
+        Position of the sample id in the split name. Defaults to ``0``.
+    key
+        Read the sample id from this annotation instead of the name.
+    size_key
+        Read the abundance from this annotation, if present. Defaults to
+        ``size``; ``None`` to count each sequence once.
+
+    Returns
+    -------
+    Function mapping a name to a ``(sample, count)`` pair.
+    """
+
+    def parse(name: str) -> Tuple[str, int]:
+        base, *annotations = name.split(";")
+        attrs = dict(a.split("=", 1) for a in annotations if "=" in a)
+        if key is not None:
+            sample = attrs[key]
+        elif separator is not None:
+            sample = base.split(separator)[field]
+        else:
+            sample = base
+        count = int(attrs[size_key]) if size_key is not None and size_key in attrs else 1
+        return sample, count
+
+    return parse
+
+
+class ClusterTable:
+    """
+    Sparse cluster by sample count matrix.
+
+    Counts are stored in compressed sparse row (CSR) layout: memory is
+    proportional to the number of non-zero entries. Rows are clusters,
+    labelled by their representative sequence, and columns are samples,
+    integer-coded in order of appearance.
+    """
+
+    def __init__(self):
+        self.clusters: List[str] = []
+        self.samples: List[str] = []
+        self.indptr = array("Q", [0])
+        self.indices = array("I")
+        self.data = array("Q")
+        self._sample_codes: Dict[str, int] = {}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.clusters), len(self.samples)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def add_cluster(self, name: str, counts: Dict[str, int]):
+        """
+        Append a row.
+
+        Parameters
+        ----------
+        name
+            Cluster label.
+        counts
+            Count per sample id.
+        """
+        codes = self._sample_codes
+        coded = {}
+        for sample, count in counts.items():
+            code = codes.get(sample)
+            if code is None:
+                code = codes[sample] = len(self.samples)
+                self.samples.append(sample)
+            coded[code] = coded.get(code, 0) + count
+        for code in sorted(coded):
+            self.indices.append(code)
+            self.data.append(coded[code])
+        self.clusters.append(name)
+        self.indptr.append(len(self.data))
+
+    def row(self, index: int) -> Dict[str, int]:
+        """
+        Non-zero counts of a cluster, by sample id.
+        """
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return {self.samples[self.indices[i]]: self.data[i] for i in range(start, end)}
+
+    def to_tsv(self, output: Union[str, Path, IO[str]]):
+        """
+        Write the dense table, one row per cluster and one column per sample.
+        """
+        out = xopen(output, "w") if isinstance(output, (str, Path)) else output
+        try:
+            out.write("#OTU ID\t" + "\t".join(self.samples) + "\n")
+            for i, name in enumerate(self.clusters):
+                values = [0] * len(self.samples)
+                for j in range(self.indptr[i], self.indptr[i + 1]):
+                    values[self.indices[j]] = self.data[j]
+                out.write(name + "\t" + "\t".join(map(str, values)) + "\n")
+        finally:
+            if out is not output:
+                out.close()
+
+    def to_biom(self, output: Union[str, Path, IO[str]]):
+        """
+        Write the table in the BIOM 1.0 (JSON, sparse) format.
+        """
+        out = xopen(output, "w") if isinstance(output, (str, Path)) else output
+        try:
+            header = {
+                "id": None,
+                "format": "Biological Observation Matrix 1.0.0",
+                "format_url": "http://biom-format.org",
+                "type": "OTU table",
+                "generated_by": f"cdhit-reader {__version__}",
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "matrix_type": "sparse",
+                "matrix_element_type": "int",
+                "shape": list(self.shape),
+                "rows": [{"id": name, "metadata": None} for name in self.clusters],
+                "columns": [{"id": sample, "metadata": None} for sample in self.samples],
+            }
+            out.write(json.dumps(header)[:-1] + ', "data": [')
+            sep = ""
+            for i in range(len(self.clusters)):
+                chunk = ", ".join(
+                    f"[{i}, {self.indices[j]}, {self.data[j]}]" for j in range(self.indptr[i], self.indptr[i + 1])
+                )
+                if chunk:
+                    out.write(sep + chunk)
+                    sep = ", "
+            out.write("]}\n")
+        finally:
+            if out is not output:
+                out.close()
+
+    def to_npz(self, output: Union[str, Path, IO[bytes]]):
+        """
+        Write the CSR arrays to a NumPy ``.npz`` file, loadable with
+        ``scipy.sparse.load_npz``. Row and column labels are stored as the
+        ``rows`` and ``columns`` arrays. Requires NumPy.
+        """
+        import numpy as np
+
+        np.savez(
+            output,
+            format=np.array(b"csr"),
+            shape=np.array(self.shape),
+            data=np.frombuffer(self.data, dtype=np.uint64).astype(np.int64),
+            indices=np.frombuffer(self.indices, dtype=np.uint32).astype(np.int32),
+            indptr=np.frombuffer(self.indptr, dtype=np.uint64).astype(np.int64),
+            rows=np.array(self.clusters),
+            columns=np.array(self.samples),
+        )
+
+
+def cluster_table(
+    clstr: Union[str, Path, IO[str]], sample_of: Optional[SampleParser] = None, min_size: int = 1
+) -> ClusterTable:
+    """
+    Build a cluster by sample count table from a clustering.
+
+    Parameters
+    ----------
+    clstr
+        CD-HIT file path or IO stream.
+    sample_of
+        Function mapping a sequence name to a ``(sample, count)`` pair.
+        Defaults to ``sample_parser()``.
+    min_size
+        Skip clusters with fewer members. Defaults to ``1``.
+
+    Returns
+    -------
+    Count table.
+    """
+    if sample_of is None:
+        sample_of = sample_parser()
+    table = ClusterTable()
+    with ClstrReader(clstr) as reader:
+        for cluster in reader:
+            if len(cluster) < min_size:
+                continue
+            counts: Dict[str, int] = {}
+            for seq in cluster.sequences:
+                sample, count = sample_of(seq.name)
+                counts[sample] = counts.get(sample, 0) + count
+            table.add_cluster(cluster.refname if cluster.refname is not None else cluster.name, counts)
+    return table
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option(__version__)
+@click.argument("clstr", type=click.Path(exists=True))
+@click.option("-o", "--output", required=True, type=click.Path(), help="Output file")
+@click.option("--format", type=click.Choice(["tsv", "biom", "npz"]), default="tsv", show_default=True, help="Output format")
+@click.option("--separator", default="_", show_default=True, help="Separator between sample id and read name")
+@click.option("--field", default=0, show_default=True, help="Position of the sample id in the sequence name")
+@click.option("--sample-key", help="Read the sample id from this annotation (e.g. 'sample' for ';sample=S1')")
+@click.option("--size-key", default="size", show_default=True, help="Read abundances from this annotation")
+@click.option("--min-size", default=1, show_default=True, help="Skip clusters with fewer members")
+@click.option("--verbose", default=False, is_flag=True, help="Show verbose information")
+def table(clstr, output, format: str, separator: str, field: int, sample_key: str, size_key: str, min_size: int, verbose: bool):
+    """
+    Build a cluster by sample abundance table
+
+    \b
+    Warning
+    -------
+    The commad line interface is in EXPERIMENTAL stage.
+    """
+    parser = sample_parser(separator=separator, field=field, key=sample_key, size_key=size_key)
+    counts = cluster_table(clstr, parser, min_size=min_size)
+    if format == "biom":
+        counts.to_biom(output)
+    elif format == "npz":
+        counts.to_npz(output)
+    else:
+        counts.to_tsv(output)
+    if verbose:
+        print("{} clusters, {} samples, {} non-zero counts".format(*counts.shape, counts.nnz), file=sys.stderr)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Iterable, Optional, Union
+import io
+import re
+
+from ._fasta import Sequence
+from ._reader import _xopen
+
+__all__ = ["FastaWriter", "write_fasta"]
+
+
+@lru_cache(maxsize=None)
+def _lines(width: int):
+    # Splitting with a regular expression keeps the loop over lines in C
+    return re.compile(rb".{1,%d}" % width, re.DOTALL)
+
+
+class FastaWriter:
+    """
+    FASTA writer.
+
+    Records are accumulated in a byte buffer and written in large blocks.
+    Paths ending in ``.gz``, ``.bz2``, ``.xz`` or ``.zst`` are compressed,
+    using `threads` compression threads where supported.
+    """
+
+    def __init__(
+        self,
+        file: Union[str, Path, IO],
+        line_length: int = 0,
+        buffer_size: int = 1 << 20,
+        threads: Optional[int] = None,
+        compresslevel: Optional[int] = None,
+        mode: str = "w",
+    ):
+        """
+        Parameters
+        ----------
+        file
+            File path, or binary or text IO stream. Streams are flushed but
+            not closed by `close`.
+        line_length
+            Sequence line width, ``0`` to disable wrapping. Defaults to ``0``.
+        buffer_size
+            Bytes buffered before writing. Defaults to 1 MiB.
+        threads
+            Compression threads. Defaults to xopen's choice; ``0`` compresses
+            in the current thread.
+        compresslevel
+            Compression level. Defaults to the format's default.
+        mode
+            ``w`` to truncate, ``a`` to append. Defaults to ``w``.
+        """
+        if mode not in ("w", "a"):
+            raise ValueError(f"Invalid mode: {mode}")
+        if isinstance(file, str):
+            file = Path(file)
+
+        if isinstance(file, Path):
+            self._file = _xopen(file, mode + "b", threads=threads, compresslevel=compresslevel)
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+        self._text = isinstance(self._file, io.TextIOBase)
+        self.line_length = line_length
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+
+    def write(self, sequence: Sequence):
+        """
+        Write a record.
+
+        Parameters
+        ----------
+        sequence
+            Sequence.
+        """
+        self.write_record(sequence.name, sequence.sequence, sequence.comment, sequence.separator)
+
+    def write_record(self, name: str, sequence: str, comment: Optional[str] = None, separator: str = " "):
+        """
+        Write a record from its fields. Empty sequences raise a `ValueError`,
+        as `FastaReader` rejects records without sequence.
+
+        Parameters
+        ----------
+        name
+            Sequence name.
+        sequence
+            Sequence.
+        comment
+            Comment, written after the name and `separator`.
+        separator
+            Separator between name and comment. Defaults to ``" "``.
+        """
+        if not sequence:
+            raise ValueError(f"Empty sequence: {name}")
+        buffer = self._buffer
+        if comment:
+            buffer += f">{name}{separator}{comment}\n".encode()
+        else:
+            buffer += f">{name}\n".encode()
+
+        data = sequence.encode()
+        width = self.line_length
+        if width > 0 and len(data) > width:
+            data = b"\n".join(_lines(width).findall(data))
+        buffer += data
+        buffer += b"\n"
+
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_raw(self, data: Union[bytes, bytearray, memoryview]):
+        """
+        Write preformatted FASTA data as is.
+        """
+        if len(data) >= self.buffer_size:
+            self.flush()
+            self._write(data)
+            return
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered records.
+        """
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self):
+        """
+        Flush, and close the associated file if it was opened by the writer.
+        """
+        self.flush()
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def _write(self, data):
+        if self._text:
+            self._file.write(bytes(data).decode())
+        else:
+            self._file.write(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        self.close()
+
+
+def write_fasta(
+    file: Union[str, Path, IO], sequences: Iterable[Sequence], line_length: int = 0, threads: Optional[int] = None
+) -> int:
+    """
+    Write sequences to a FASTA file.
+
+    Parameters
+    ----------
+    file
+        File path or IO stream.
+    sequences
+        Sequences.
+    line_length
+        Sequence line width, ``0`` to disable wrapping. Defaults to ``0``.
+    threads
+        Compression threads. Defaults to xopen's choice.
+
+    Returns
+    -------
+    Number of sequences written.
+    """
+    n = 0
+    with FastaWriter(file, line_length=line_length, threads=threads) as writer:
+        for sequence in sequences:
+            writer.write(sequence)
+            n += 1
+    return n
@@ -0,0 +1,45 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+def _input_path(name):
+    filePath = os.path.join(Path(os.path.dirname(__file__)), name)
+    if not os.path.exists(filePath):
+        pytest.skip("File not found: {}".format(filePath))
+    return filePath
+
+
+def _cluster_summary(cluster):
+    return (
+        cluster.name,
+        cluster.refname,
+        [(s.id, s.name, s.length, s.identity, s.is_ref, s.seqtype, s.strand, s.line) for s in cluster.sequences],
+    )
+
+
+@pytest.fixture
+def input_path():
+    """
+    Path of a test input file, skipping the test if it is missing.
+    """
+    return _input_path
+
+
+@pytest.fixture
+def copy_input(tmp_path):
+    """
+    Copy of a test input file in the test's temporary directory.
+    """
+    return lambda name: shutil.copy(_input_path(name), tmp_path / name)
+
+
+@pytest.fixture
+def cluster_summary():
+    """
+    Comparable summary of a cluster and its members. Defined at module
+    level, so that it can be sent to worker processes.
+    """
+    return _cluster_summary
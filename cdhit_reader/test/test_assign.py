@@ -0,0 +1,46 @@
+import random
+
+from cdhit_reader import RepresentativeIndex, SeqType, Strand, read_cdhit, read_fasta
+from cdhit_reader._assign import word_length
+
+
+def test_word_length():
+    assert word_length(0.9, SeqType.PROTEIN) == 5
+    assert word_length(0.55, SeqType.PROTEIN) == 3
+    assert word_length(0.97, SeqType.NT) == 10
+    assert word_length(0.75, SeqType.NT) == 4
+
+
+def test_assign_agrees_with_clustering(input_path):
+    clstr = input_path("small_aa.clstr")
+    fasta = input_path("small_aa.faa")
+
+    index = RepresentativeIndex.from_files(clstr, fasta, identity=0.9)
+    assert index.seqtype == SeqType.PROTEIN
+    assert index.k == 5
+
+    expected = {s.name: c.refname for c in read_cdhit(clstr) for s in c.sequences}
+    assignments = index.assign(read_fasta(fasta))
+    assert len(assignments) == 9
+    for assignment in assignments:
+        assert assignment.representative == expected[assignment.query]
+        assert assignment.identity >= 0.9
+        assert assignment.strand == Strand.NONE
+
+
+def test_assign_new_cluster_and_strand():
+    rng = random.Random(42)
+    reference = "".join(rng.choice("ACGT") for _ in range(300))
+    other = "".join(rng.choice("ACGT") for _ in range(300))
+    index = RepresentativeIndex([("ref", reference), ("other", other)], identity=0.95)
+    assert index.seqtype == SeqType.NT
+
+    mutated = reference[:100] + ("A" if reference[100] != "A" else "C") + reference[101:250]
+    reverse = mutated.translate(str.maketrans("ACGT", "TGCA"))[::-1]
+    unrelated = "".join(rng.choice("ACGT") for _ in range(300))
+
+    forward, backward, new = index.assign([("fwd", mutated), ("rev", reverse), ("new", unrelated)])
+    assert forward.representative == "ref" and forward.strand == Strand.PLUS
+    assert 0.95 <= forward.identity < 1.0
+    assert backward.representative == "ref" and backward.strand == Strand.REVERSE
+    assert new.representative is None
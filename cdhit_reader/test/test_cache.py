@@ -0,0 +1,68 @@
+import pickle
+
+from cdhit_reader import ClstrCache, read_cdhit
+
+
+def test_cache_roundtrip(tmp_path, copy_input, cluster_summary):
+    filePath = copy_input("small_nt.clstr")
+    cache_dir = tmp_path / "cache"
+
+    expected = [cluster_summary(c) for c in read_cdhit(filePath)]
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        assert [cluster_summary(c) for c in reader] == expected
+    snapshot = ClstrCache(cache_dir).snapshot_path(filePath)
+    assert snapshot.exists()
+
+    # Second load reuses the snapshot
+    built = snapshot.stat().st_ino
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        assert len(reader) == len(expected)
+        assert cluster_summary(reader[-1]) == expected[-1]
+        assert [cluster_summary(c) for c in reader.read_items()] == expected
+    assert snapshot.stat().st_ino == built
+
+
+def test_cache_lazy_members(tmp_path, copy_input, cluster_summary):
+    filePath = copy_input("nt.clstr")
+    cache_dir = tmp_path / "cache"
+    expected = [cluster_summary(c) for c in read_cdhit(filePath)]
+
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        clusters = reader.read_items()
+    # Names and sizes come without decoding the members
+    assert [(c.name, c.refname, len(c)) for c in clusters] == [(e[0], e[1], len(e[2])) for e in expected]
+    assert not any("sequences" in vars(c) for c in clusters)
+    # Members are still readable once the snapshot is closed, and survive pickling
+    assert [cluster_summary(pickle.loads(pickle.dumps(c))) for c in clusters] == expected
+    assert [cluster_summary(c) for c in clusters] == expected
+
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        with reader.read_items(max_memory=1) as spilled:
+            assert [cluster_summary(c) for c in spilled] == expected
+
+
+def test_cache_invalidation(tmp_path, copy_input):
+    filePath = copy_input("small_nt.clstr")
+    cache_dir = tmp_path / "cache"
+
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        nclusters = len(reader)
+
+    with open(filePath, "a") as fh:
+        fh.write(">Cluster {}\n0\t100nt, >extra... *\n".format(nclusters))
+
+    with read_cdhit(filePath, cache_dir=cache_dir) as reader:
+        clusters = reader.read_items()
+    assert len(clusters) == nclusters + 1
+    assert clusters[-1].refname == "extra"
+
+
+def test_cache_eviction(tmp_path, copy_input):
+    first = copy_input("small_nt.clstr")
+    second = copy_input("small_aa.clstr")
+    cache = ClstrCache(tmp_path / "cache", max_size=1)
+
+    cache.open(first).close()
+    cache.open(second).close()
+    assert not cache.snapshot_path(first).exists()
+    assert cache.snapshot_path(second).exists()
@@ -0,0 +1,38 @@
+
+import pytest
+from cdhit_reader import ClusterCollection, read_cdhit
+
+
+def test_read_items_unbounded(input_path):
+    clusters = read_cdhit(input_path("nt.clstr")).read_items()
+    assert isinstance(clusters, list)
+    assert [len(c) for c in clusters] == [5, 4, 11, 3, 6, 1, 2]
+
+
+def test_read_items_max_memory(input_path, cluster_summary):
+    expected = [cluster_summary(c) for c in read_cdhit(input_path("nt.clstr"))]
+
+    # Room for about one cluster: all the others go to disk
+    with read_cdhit(input_path("nt.clstr")).read_items(max_memory=1) as clusters:
+        assert isinstance(clusters, ClusterCollection)
+        assert len(clusters) == 7
+        assert clusters.spilled == 6
+        assert [cluster_summary(c) for c in clusters] == expected
+        assert cluster_summary(clusters[2]) == expected[2]
+        assert cluster_summary(clusters[-1]) == expected[-1]
+        assert [cluster_summary(c) for c in clusters[1:4]] == expected[1:4]
+        with pytest.raises(IndexError):
+            clusters[7]
+
+
+def test_collection_keeps_recent(input_path):
+    clusters = ClusterCollection(read_cdhit(input_path("nt.clstr")), max_memory=1 << 20)
+    assert clusters.spilled == 0
+
+    budget = 3000
+    clusters = ClusterCollection(read_cdhit(input_path("nt.clstr")), max_memory=budget)
+    assert 0 < clusters.spilled < len(clusters)
+    # The last clusters read are the ones in memory
+    assert len(clusters) - 1 in clusters._memory
+    first = clusters[0]
+    assert clusters[0] is first
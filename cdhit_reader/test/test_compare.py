@@ -0,0 +1,35 @@
+import io
+
+from cdhit_reader import read_cdhit, read_fasta
+from cdhit_reader._compare import expand_cluster, relabel_fasta
+
+
+def test_relabel_dedup(tmp_path):
+    fasta1 = tmp_path / "a.fa"
+    fasta2 = tmp_path / "b.fa"
+    fasta1.write_text(">x1 first\nACGT\n>x2\nACGA\n>x3\nACGT\n")
+    fasta2.write_text(">y1\nAC\nGA\n>y2\nTTTT\n")
+
+    output = tmp_path / "seqs.fasta"
+    seen = {}
+    duplicates = {}
+    relabel_fasta(fasta1, "1:::", output, seen, duplicates)
+    relabel_fasta(fasta2, "2:::", output, seen, duplicates)
+
+    assert [s.name for s in read_fasta(str(output))] == ["1:::x1", "1:::x2", "2:::y2"]
+    assert duplicates == {"1:::x1": ["1:::x3"], "1:::x2": ["2:::y1"]}
+
+
+def test_expand_cluster():
+    clstr = io.StringIO(">Cluster 0\n0\t4nt, >1:::x1... *\n1\t4nt, >1:::x2... at +/75.00%\n")
+    cluster = next(iter(read_cdhit(clstr)))
+
+    expanded = expand_cluster(cluster, {"1:::x1": ["1:::x3"], "1:::x2": ["2:::y1"]})
+    assert expanded.refname == "1:::x1"
+    assert [(s.id, s.name, s.is_ref, s.identity) for s in expanded.sequences] == [
+        (0, "1:::x1", True, 100.0),
+        (1, "1:::x3", False, 100.0),
+        (2, "1:::x2", False, 75.0),
+        (3, "2:::y1", False, 75.0),
+    ]
+    assert expand_cluster(cluster, {}) is cluster
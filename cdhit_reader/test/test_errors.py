@@ -0,0 +1,113 @@
+import io
+
+import pytest
+from cdhit_reader import ClusterSequence, ParsingError, ParsingReport, read_cdhit, read_fasta
+
+CLSTR = (
+    ">Cluster 0\n"
+    "0\t492nt, >seq1.A... *\n"
+    ">Cluster 1\n"
+    "0\t492nt, >seq2.A... *\n"
+    "1\tgarbage\n"
+    "2\t492nt, >seq2.C... at +/99.00%\n"
+    ">Cluster 2\n"
+    ">Cluster 3\n"
+    "0\t369nt, >seq4.A... *\n"
+)
+
+FASTA = (
+    ">s1 first\nACGT\nAC\n"
+    ">s2\n"
+    ">s3\nGGGG\n"
+    "\n"
+    "stray\n"
+    "TTTT\n"
+    ">s4\nCCCC\n"
+)
+
+
+def test_member_line():
+    with pytest.raises(ValueError):
+        ClusterSequence("garbage")
+
+
+def test_clstr_strict():
+    with pytest.raises(ParsingError) as error:
+        read_cdhit(io.StringIO(CLSTR)).read_items()
+    assert error.value.line_number == 5
+    assert error.value.offset == CLSTR.index(">Cluster 1")
+
+
+def test_clstr_collect():
+    reader = read_cdhit(io.StringIO(CLSTR), errors="collect")
+    clusters = reader.read_items()
+    assert [c.name for c in clusters] == ["Cluster 0", "Cluster 3"]
+    assert clusters[1].refname == "seq4.A"
+
+    assert isinstance(reader.report, ParsingReport)
+    assert len(reader.report) == 2
+    assert [(e.line_number, e.offset) for e in reader.report] == [
+        (5, CLSTR.index(">Cluster 1")),
+        (7, CLSTR.index(">Cluster 2")),
+    ]
+
+
+def test_clstr_skip():
+    reader = read_cdhit(io.StringIO(CLSTR), errors="skip")
+    assert len(reader.read_items()) == 2
+    assert reader.report.count == 2
+    assert reader.report.errors == []
+
+
+def test_fasta():
+    with pytest.raises(ParsingError) as error:
+        read_fasta(io.StringIO(FASTA)).read_items()
+    assert error.value.line_number == 4
+
+    reader = read_fasta(io.StringIO(FASTA), errors="collect")
+    assert [(s.name, s.sequence) for s in reader] == [("s1", "ACGTAC"), ("s3", "GGGG"), ("s4", "CCCC")]
+    assert [(e.line_number, e.offset) for e in reader.report] == [
+        (4, FASTA.index(">s2")),
+        (8, FASTA.index("stray")),
+    ]
+
+
+@pytest.mark.parametrize("errors", ["strict", "skip", "collect"])
+def test_truncated(errors):
+    truncated = ">Cluster 0\n0\t10nt, >a... *\n>Cluster 1\n"
+    reader = read_cdhit(io.StringIO(truncated), errors=errors)
+    if errors == "strict":
+        with pytest.raises(ParsingError) as error:
+            reader.read_items()
+        assert (error.value.line_number, error.value.offset) == (3, truncated.index(">Cluster 1"))
+        return
+    assert [c.name for c in reader.read_items()] == ["Cluster 0"]
+    assert reader.report.count == 1
+    if errors == "collect":
+        assert [(e.line_number, e.offset) for e in reader.report] == [(3, truncated.index(">Cluster 1"))]
+
+    reader = read_fasta(io.StringIO(">s1\nACGT\n>s2\n"), errors=errors)
+    assert [s.name for s in reader] == ["s1"]
+    assert reader.report.count == 1
+
+
+def test_byte_offsets(tmp_path):
+    # Windows line endings and a non-ASCII name before the bad record
+    data = CLSTR.replace("seq1.A", "séq1.A").replace("\n", "\r\n").encode()
+    path = tmp_path / "crlf.clstr"
+    path.write_bytes(data)
+    reader = read_cdhit(str(path), errors="collect")
+    assert [c.refname for c in reader.read_items()] == ["séq1.A", "seq4.A"]
+    assert [e.offset for e in reader.report] == [data.index(b">Cluster 1"), data.index(b">Cluster 2")]
+
+    data = FASTA.replace("first", "prémier").replace("\n", "\r\n").encode()
+    path = tmp_path / "crlf.fa"
+    path.write_bytes(data)
+    reader = read_fasta(str(path), errors="collect")
+    assert [s.sequence for s in reader] == ["ACGTAC", "GGGG", "CCCC"]
+    assert [e.offset for e in reader.report] == [data.index(b">s2"), data.index(b"stray")]
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        read_fasta(io.StringIO(FASTA), errors="ignore")
@@ -0,0 +1,55 @@
+import io
+import sqlite3
+
+import pytest
+from cdhit_reader import ParsingError, export_sqlite, export_tsv
+
+
+def test_export_tsv(tmp_path, input_path):
+    output = tmp_path / "members.tsv"
+    assert export_tsv(input_path("small_nt.clstr"), output, batch_size=1) == 7
+
+    rows = [line.rstrip("\n").split("\t") for line in open(output)]
+    assert rows[0] == ["cluster_id", "cluster", "member_id", "name", "length", "identity", "is_representative", "strand"]
+    assert rows[1] == ["0", "Cluster 0", "0", "seq1.A", "492", "100.0", "1", "+"]
+    assert rows[4] == ["0", "Cluster 0", "3", "seq1.D", "404", "95.54", "0", "-"]
+
+
+def test_export_sqlite(tmp_path, input_path):
+    database = tmp_path / "clusters.db"
+    # Exporting twice replaces the tables
+    export_sqlite(input_path("small_aa.clstr"), database, batch_size=2)
+    assert export_sqlite(input_path("small_aa.clstr"), database, batch_size=2) == 10
+
+    con = sqlite3.connect(str(database))
+    assert con.execute("SELECT COUNT(*) FROM clusters").fetchone() == (7,)
+    assert con.execute("SELECT id, representative, size FROM clusters WHERE id = 2").fetchone() == (2, "IBJJOHBJ_00006", 3)
+    assert con.execute(
+        "SELECT c.representative FROM members m JOIN clusters c ON c.id = m.cluster_id WHERE m.name = ?", ("CBJJOHBJ_000C6",)
+    ).fetchone() == ("IBJJOHBJ_00006",)
+    indexes = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"members_cluster_id", "members_name", "clusters_representative"} <= indexes
+    con.close()
+
+
+def test_export_sqlite_failure(tmp_path, input_path):
+    bad = ">Cluster 0\n0\t10nt, >a... *\n1\tgarbage\n"
+
+    # A database created by the export is removed
+    database = tmp_path / "new.db"
+    with pytest.raises(ParsingError):
+        export_sqlite(io.StringIO(bad), database)
+    assert not database.exists()
+
+    # An existing one is rolled back, keeping its journal mode
+    database = tmp_path / "shared.db"
+    export_sqlite(input_path("small_aa.clstr"), database)
+    con = sqlite3.connect(str(database))
+    con.execute("PRAGMA journal_mode = WAL")
+    con.close()
+    with pytest.raises(ParsingError):
+        export_sqlite(io.StringIO(bad), database, batch_size=1)
+    con = sqlite3.connect(str(database))
+    assert con.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert con.execute("SELECT COUNT(*) FROM members").fetchone() == (10,)
+    con.close()
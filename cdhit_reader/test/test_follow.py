@@ -0,0 +1,60 @@
+import subprocess
+import sys
+import threading
+import time
+
+from cdhit_reader import read_cdhit
+
+CLUSTERS = [
+    ">Cluster 0\n0\t492nt, >seq1.A... *\n1\t492nt, >seq1.B... at +/99.39%\n",
+    ">Cluster 1\n0\t492nt, >seq2.A... *\n",
+    ">Cluster 2\n0\t492nt, >seq3.A... *\n1\t369nt, >seq3.C... at -/98.00%\n",
+]
+
+
+def _write_slowly(path, marker=None):
+    with open(path, "a") as fh:
+        for text in CLUSTERS:
+            # Split lines across writes to exercise partial reads
+            for i in range(0, len(text), 7):
+                fh.write(text[i:i + 7])
+                fh.flush()
+                time.sleep(0.002)
+    if marker is not None:
+        open(marker, "w").close()
+
+
+def test_follow_marker(tmp_path):
+    path = tmp_path / "clusters.clstr"
+    marker = tmp_path / "done"
+    path.write_text("")
+
+    writer = threading.Thread(target=_write_slowly, args=(path, marker))
+    writer.start()
+    clusters = read_cdhit(path, follow=True, marker=marker, poll_interval=0.001, max_interval=0.01).read_items()
+    writer.join()
+
+    assert [c.name for c in clusters] == ["Cluster 0", "Cluster 1", "Cluster 2"]
+    assert [len(c) for c in clusters] == [2, 1, 2]
+    assert clusters[2].sequences[1].name == "seq3.C"
+
+
+def test_follow_producer(tmp_path):
+    path = tmp_path / "clusters.clstr"
+    path.write_text(CLUSTERS[0])
+    producer = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+
+    start = time.monotonic()
+    with read_cdhit(path, follow=True, producer=producer, poll_interval=0.01) as reader:
+        clusters = reader.read_items()
+    assert time.monotonic() - start >= 0.15
+    assert producer.returncode == 0
+    assert len(clusters) == 1
+
+
+def test_follow_timeout(tmp_path):
+    path = tmp_path / "clusters.clstr"
+    path.write_text("".join(CLUSTERS))
+
+    with read_cdhit(path, follow=True, timeout=0.05, poll_interval=0.01) as reader:
+        assert len(reader.read_items()) == 3
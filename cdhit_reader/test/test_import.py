@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import cdhit_reader
+import pytest
+
+# About four times the usual import time (~25 ms), taking the best of a
+# few runs so that a busy machine does not fail the test. Eager imports of
+# the optional modules are caught by the module check.
+IMPORT_BUDGET = 0.1
+IMPORT_RUNS = 3
+
+SCRIPT = """
+import sys, time
+t = time.perf_counter()
+import cdhit_reader
+print(time.perf_counter() - t)
+print(",".join(sorted(sys.modules)))
+"""
+
+
+def test_import_time():
+    timings = []
+    for _ in range(IMPORT_RUNS):
+        out = subprocess.run([sys.executable, "-c", SCRIPT], check=True, stdout=subprocess.PIPE, text=True).stdout
+        elapsed, modules = out.splitlines()
+        timings.append(float(elapsed))
+    modules = set(modules.split(","))
+    for module in ["click", "xopen", "subprocess", "statistics", "sqlite3", "cdhit_reader._cli", "cdhit_reader._compare"]:
+        assert module not in modules
+    assert min(timings) < IMPORT_BUDGET
+
+
+def test_lazy_attributes():
+    assert cdhit_reader.compare.name == "compare"
+    assert callable(cdhit_reader.split_clusters)
+    assert "cli" in dir(cdhit_reader)
+    with pytest.raises(AttributeError):
+        cdhit_reader.missing
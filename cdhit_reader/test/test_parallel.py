@@ -0,0 +1,49 @@
+import gzip
+import io
+import operator
+
+import pytest
+from cdhit_reader import map_clusters, read_cdhit, reduce_clusters
+from cdhit_reader._parallel import _byte_ranges
+
+
+def _size(cluster):
+    return len(cluster)
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 1 << 20])
+def test_byte_ranges(block_size, input_path):
+    filePath = input_path("nt.clstr")
+    ranges = list(_byte_ranges(filePath, 2, block_size=block_size))
+    data = open(filePath, "rb").read()
+    assert ranges[0][1] == 0
+    assert ranges[-1][2] == len(data)
+    for (_, start, end), (_, next_start, _) in zip(ranges, ranges[1:]):
+        assert end == next_start
+    for _, start, end in ranges:
+        assert (b"\n" + data[start:end]).count(b"\n>") <= 2
+        assert data[start:start + 1] == b">"
+
+
+def test_map_clusters(tmp_path, input_path, cluster_summary):
+    filePath = input_path("nt.clstr")
+    expected = [cluster_summary(c) for c in read_cdhit(filePath)]
+
+    assert list(map_clusters(filePath, cluster_summary, workers=2, chunksize=2)) == expected
+    assert sorted(map_clusters(filePath, cluster_summary, workers=2, chunksize=1, ordered=False)) == sorted(expected)
+    assert list(map_clusters(filePath, cluster_summary, workers=1, chunksize=3)) == expected
+
+    # Compressed files and streams are sent to the workers as text
+    compressed = tmp_path / "nt.clstr.gz"
+    with gzip.open(compressed, "wb") as out:
+        out.write(open(filePath, "rb").read())
+    assert list(map_clusters(compressed, cluster_summary, workers=2, chunksize=2)) == expected
+    stream = io.StringIO(open(filePath).read())
+    assert list(map_clusters(stream, cluster_summary, workers=2, chunksize=2)) == expected
+
+
+def test_reduce_clusters(input_path):
+    filePath = input_path("nt.clstr")
+    total = sum(len(c) for c in read_cdhit(filePath))
+    assert reduce_clusters(filePath, _size, operator.add, 0, workers=2, chunksize=2) == total
+    assert reduce_clusters(filePath, _size, max, 0, workers=1) == max(len(c) for c in read_cdhit(filePath))
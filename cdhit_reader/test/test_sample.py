@@ -0,0 +1,72 @@
+import gzip
+import io
+
+import pytest
+from click.testing import CliRunner
+from cdhit_reader import cli, ClusterIndex, read_cdhit, sample_clusters
+
+
+def test_cluster_index(input_path):
+    filePath = input_path("nt.clstr")
+    clusters = list(read_cdhit(filePath))
+    index = ClusterIndex(filePath)
+    assert len(index) == len(clusters)
+    assert list(index.sizes) == [len(c) for c in clusters]
+    for i in [0, len(clusters) // 2, len(clusters) - 1]:
+        assert index.read(i).refname == clusters[i].refname
+        assert [s.name for s in index.read(i).sequences] == [s.name for s in clusters[i].sequences]
+
+
+def test_sample_seekable(input_path):
+    filePath = input_path("nt.clstr")
+    names = [c.name for c in read_cdhit(filePath)]
+
+    sample = sample_clusters(filePath, 3, seed=1)
+    assert len(sample) == 3
+    positions = [names.index(c.name) for c in sample]
+    assert positions == sorted(positions)
+    assert [c.name for c in sample_clusters(filePath, 3, seed=1)] == [c.name for c in sample]
+    assert len(sample_clusters(filePath, 100)) == len(names)
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_sample_stratified(tmp_path, compressed, input_path):
+    filePath = input_path("nt.clstr")
+    if compressed:
+        # Falls back to reservoir sampling
+        path = tmp_path / "nt.clstr.gz"
+        with gzip.open(path, "wb") as out:
+            out.write(open(filePath, "rb").read())
+        filePath = str(path)
+    # One cluster per stratum: 1, 2 to 3, and 4 or more members
+    sample = sample_clusters(filePath, 1, seed=7, strata=[1, 2, 4])
+    sizes = sorted(len(c) for c in sample)
+    assert len(sizes) == 3
+    assert sizes[0] == 1 and 2 <= sizes[1] <= 3 and sizes[2] >= 4
+    assert [c.name for c in sample_clusters(filePath, 1, seed=7, strata=[1, 2, 4])] == [c.name for c in sample]
+    assert all(len(c) >= 2 for c in sample_clusters(filePath, 10, strata=[2]))
+
+
+def test_sample_stream():
+    text = "".join(">Cluster {}\n0\t10aa, >s{}... *\n".format(i, i) for i in range(50))
+    sample = sample_clusters(io.StringIO(text), 5, seed=3)
+    assert len(sample) == 5
+    assert len({c.name for c in sample}) == 5
+
+
+def test_cli_sample(input_path):
+    filePath = input_path("nt.clstr")
+    runner = CliRunner()
+
+    # No cluster reaches the stratum bound: an empty sample
+    result = runner.invoke(cli, [filePath, "--sample", "5", "--strata", "20"])
+    assert result.exit_code == 0, result.output
+    assert "Number of clusters: 0" in result.output
+
+    result = runner.invoke(cli, [filePath, "--sample", "2", "--seed", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Number of clusters: 2" in result.output
+
+    result = runner.invoke(cli, [filePath, "--strata", "1,2"])
+    assert result.exit_code == 2
+    assert "require --sample" in result.output
@@ -0,0 +1,66 @@
+import io
+
+import pytest
+from cdhit_reader import read_cdhit, sort_clusters
+from cdhit_reader import _sort
+
+
+def _sorted(filePath, **kwargs):
+    output = io.StringIO()
+    sort_clusters(filePath, output, **kwargs)
+    return list(read_cdhit(io.StringIO(output.getvalue())))
+
+
+@pytest.mark.parametrize("max_memory", [1, 1 << 20])
+def test_sort_by_size(max_memory, input_path):
+    filePath = input_path("nt.clstr")
+    clusters = list(read_cdhit(filePath))
+
+    result = _sorted(filePath, by="size", reverse=True, max_memory=max_memory)
+    # Stable: same-size clusters keep their input order
+    expected = [c for _, c in sorted(enumerate(clusters), key=lambda item: (-len(item[1]), item[0]))]
+    assert [c.refname for c in result] == [c.refname for c in expected]
+    assert [c.name for c in result] == ["Cluster {}".format(i) for i in range(len(clusters))]
+    for cluster in result:
+        assert [s.id for s in cluster.sequences] == list(range(len(cluster)))
+
+
+@pytest.mark.parametrize("max_memory", [1, 1 << 20])
+def test_sort_by_name_filtered(max_memory, input_path):
+    filePath = input_path("small_aa.clstr")
+    result = _sorted(filePath, by="name", min_size=2, max_memory=max_memory)
+    assert [c.refname for c in result] == ["IBJJOHBJ_00001", "IBJJOHBJ_00006"]
+    assert [s.name for s in result[1].sequences] == ["IBJJOHBJ_00006", "BBJJOHBJ_000B6", "CBJJOHBJ_000C6"]
+    assert result[1].sequences[2].identity == 97.11
+
+
+def test_renumber():
+    clstr = ">Cluster 5\n3\t10aa, >a... *\n>Cluster 9\n7\t10aa, >b... *\n4\t9aa, >c... at 90.00%\n"
+    output = io.StringIO()
+    assert sort_clusters(io.StringIO(clstr), output, by="input") == 2
+    assert output.getvalue() == ">Cluster 0\n0\t10aa, >a... *\n>Cluster 1\n0\t10aa, >b... *\n1\t9aa, >c... at 90.00%\n"
+
+
+def test_sort_bounded_merge(monkeypatch):
+    clstr = "".join(">Cluster {0}\n0\t10aa, >s{0}... *\n".format(i) for i in range(200))
+    expected = io.StringIO()
+    sort_clusters(io.StringIO(clstr), expected, by="name")
+
+    # Count the runs read at the same time
+    read_run = _sort._read_run
+    open_runs = []
+    peak = []
+
+    def counting(path):
+        open_runs.append(path)
+        peak.append(len(open_runs))
+        try:
+            yield from read_run(path)
+        finally:
+            open_runs.remove(path)
+
+    monkeypatch.setattr(_sort, "_read_run", counting)
+    output = io.StringIO()
+    assert sort_clusters(io.StringIO(clstr), output, by="name", max_memory=1, fan_in=4) == 200
+    assert output.getvalue() == expected.getvalue()
+    assert max(peak) == 4
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+from cdhit_reader import read_fasta, split_clusters
+
+
+def test_split(tmp_path, input_path):
+    clstr = input_path("small_aa.clstr")
+    fasta = input_path("small_aa.faa")
+
+    # A single open handle forces files to be closed and reopened. The
+    # member of cluster 5 is missing from the FASTA file.
+    with pytest.warns(UserWarning, match="1 of 10 cluster members not found"):
+        counts = split_clusters(clstr, fasta, tmp_path, max_open=1)
+    assert counts == {0: 1, 1: 2, 2: 3, 3: 1, 4: 1, 6: 1}
+    assert [s.name for s in read_fasta(str(tmp_path / "cluster_2.fa"))] == [
+        "IBJJOHBJ_00006",
+        "BBJJOHBJ_000B6",
+        "CBJJOHBJ_000C6",
+    ]
+
+
+def test_split_min_size_compressed(tmp_path, input_path):
+    clstr = input_path("small_aa.clstr")
+    fasta = input_path("small_aa.faa")
+
+    counts = split_clusters(clstr, fasta, tmp_path, min_size=2, max_open=1, compress="gz", prefix="c")
+    assert counts == {1: 2, 2: 3}
+    assert sorted(os.listdir(tmp_path)) == ["c1.fa.gz", "c2.fa.gz"]
+    assert [s.name for s in read_fasta(str(tmp_path / "c2.fa.gz"))] == [
+        "IBJJOHBJ_00006",
+        "BBJJOHBJ_000B6",
+        "CBJJOHBJ_000C6",
+    ]
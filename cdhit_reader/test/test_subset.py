@@ -0,0 +1,75 @@
+import hashlib
+import io
+import sys
+import warnings
+
+import pytest
+from cdhit_reader import NameSet, cluster_members, read_fasta, representatives, subset_fasta
+
+
+def _expected(fasta, names):
+    records = []
+    keep = False
+    with open(fasta, "rb") as fh:
+        for line in fh:
+            if line.startswith(b">"):
+                keep = line[1:].split()[0] in names
+            if keep:
+                records.append(line)
+    return b"".join(records)
+
+
+def test_nameset():
+    names = NameSet(["seq1", "seq2", b"seq3"])
+    assert len(names) == 3
+    assert "seq1" in names
+    assert b"seq3" in names
+    assert "seq4" not in names
+    # Keys do not depend on the interpreter's hash width or randomization
+    assert names._hashes.itemsize == 8
+    assert list(NameSet(["seq1"])._hashes) == [int.from_bytes(hashlib.blake2b(b"seq1", digest_size=8).digest(), "little")]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_nameset_sort(monkeypatch, numpy):
+    from cdhit_reader import _subset
+
+    if not numpy:
+        # Chunked sort, with several chunks to merge
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        monkeypatch.setattr(_subset, "_SORT_CHUNK", 7)
+    names = [f"seq{i % 40}" for i in range(100)]
+    hashes = NameSet(names)._hashes
+    assert list(hashes) == sorted(set(_subset._hash(name) for name in names))
+    assert len(NameSet([])) == 0
+
+
+def test_subset_representatives(tmp_path, input_path):
+    clstr = input_path("small_aa.clstr")
+    fasta = input_path("small_aa.faa")
+
+    output = tmp_path / "reps.faa"
+    # One representative is missing from the FASTA file
+    with pytest.warns(UserWarning, match="1 of 7 names not found"):
+        assert subset_fasta(fasta, representatives(clstr), output) == 6
+    assert [s.name for s in read_fasta(str(output))] == [
+        "IBJJOHBJ_00001",
+        "IBJJOHBJ_00003",
+        "IBJJOHBJ_00004",
+        "IBJJOHBJ_00005",
+        "IBJJOHBJ_00006",
+        "IBJJOHBJ_00007",
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7, 61, 1 << 20])
+def test_subset_block_boundaries(block_size, input_path):
+    clstr = input_path("small_aa.clstr")
+    fasta = input_path("small_aa.faa")
+
+    names = cluster_members(clstr, min_size=2)
+    output = io.BytesIO()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert subset_fasta(fasta, names, output, block_size=block_size) == 5
+    assert output.getvalue() == _expected(fasta, {b"IBJJOHBJ_00001", b"IBJJOHBJ_000F1", b"IBJJOHBJ_00006", b"BBJJOHBJ_000B6", b"CBJJOHBJ_000C6"})
@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+from cdhit_reader import cluster_table, sample_parser
+
+CLSTR = """>Cluster 0
+0\t100nt, >S1_r1;size=3;... *
+1\t100nt, >S2_r2;size=2;... at +/99.00%
+2\t100nt, >S1_r3;size=1;... at +/98.00%
+>Cluster 1
+0\t100nt, >S3_r4;size=5;... *
+"""
+
+
+def test_sample_parser():
+    assert sample_parser()("S1_r1;size=3;") == ("S1", 3)
+    assert sample_parser(size_key=None)("S1_r1;size=3;") == ("S1", 1)
+    assert sample_parser(key="sample")("r1;sample=gut;size=2") == ("gut", 2)
+    assert sample_parser(separator=".", field=1)("r1.S2") == ("S2", 1)
+
+
+def test_cluster_table():
+    table = cluster_table(io.StringIO(CLSTR))
+    assert table.shape == (2, 3)
+    assert table.nnz == 3
+    assert table.clusters == ["S1_r1;size=3;", "S3_r4;size=5;"]
+    assert table.samples == ["S1", "S2", "S3"]
+    assert table.row(0) == {"S1": 4, "S2": 2}
+    assert table.row(1) == {"S3": 5}
+
+    tsv = io.StringIO()
+    table.to_tsv(tsv)
+    assert tsv.getvalue().splitlines()[1:] == ["S1_r1;size=3;\t4\t2\t0", "S3_r4;size=5;\t0\t0\t5"]
+
+    biom = io.StringIO()
+    table.to_biom(biom)
+    data = json.loads(biom.getvalue())
+    assert data["shape"] == [2, 3]
+    assert data["data"] == [[0, 0, 4], [0, 1, 2], [1, 2, 5]]
+
+
+def test_cluster_table_npz(tmp_path):
+    np = pytest.importorskip("numpy")
+    table = cluster_table(io.StringIO(CLSTR), min_size=2)
+    table.to_npz(tmp_path / "table.npz")
+    arrays = np.load(tmp_path / "table.npz")
+    assert list(arrays["shape"]) == [1, 2]
+    assert list(arrays["data"]) == [4, 2]
@@ -0,0 +1,38 @@
+import io
+
+import pytest
+from cdhit_reader import FastaWriter, Sequence, read_fasta, write_fasta
+
+
+def test_write_wrapped():
+    out = io.BytesIO()
+    # A tiny buffer forces a flush after every record
+    with FastaWriter(out, line_length=4, buffer_size=8) as writer:
+        writer.write(Sequence("s1", "ACGTACGTAC", "first"))
+        writer.write_record("s2", "ACGT", "second", separator="\t")
+        # Records without sequence would not be read back
+        with pytest.raises(ValueError):
+            writer.write_record("s3", "")
+    assert out.getvalue() == b">s1 first\nACGT\nACGT\nAC\n>s2\tsecond\nACGT\n"
+
+
+def test_write_text_stream():
+    out = io.StringIO()
+    with FastaWriter(out) as writer:
+        writer.write_raw(b">s1\nAC\n")
+        writer.write_record("s2", "GT")
+    assert out.getvalue() == ">s1\nAC\n>s2\nGT\n"
+
+
+@pytest.mark.parametrize("suffix", [".fa", ".fa.gz"])
+def test_write_fasta_roundtrip(tmp_path, suffix, input_path):
+    sequences = list(read_fasta(input_path("small_aa.faa")))
+    path = tmp_path / ("out" + suffix)
+    assert write_fasta(str(path), sequences, line_length=60, threads=0) == len(sequences)
+    assert [(s.name, s.comment, s.sequence) for s in read_fasta(str(path))] == [
+        (s.name, s.comment, s.sequence) for s in sequences
+    ]
+
+    with FastaWriter(path, mode="a", threads=0) as writer:
+        writer.write(sequences[0])
+    assert len(list(read_fasta(str(path)))) == len(sequences) + 1
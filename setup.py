@@ -1,5 +1,5 @@
 from setuptools import setup
 
 if __name__ == "__main__":
-    console_scripts = ["cdhit-parser = cdhit_reader:cli", "cdhit-compare = cdhit_reader:compare"]
+    console_scripts = ["cdhit-parser = cdhit_reader:cli", "cdhit-compare = cdhit_reader:compare", "cdhit-split = cdhit_reader:split", "cdhit-subset = cdhit_reader:subset", "cdhit-export = cdhit_reader:export", "cdhit-table = cdhit_reader:table", "cdhit-sort = cdhit_reader:sort"]
     setup(entry_points=dict(console_scripts=console_scripts))